@@ -1,15 +1,22 @@
 """Backend Module"""
 
-from datetime import datetime
-from typing import Union
-import pandas as pd
+import os
+import time
+import inspect
+import functools
+import contextlib
+from datetime import date, datetime
+from typing import Callable, ContextManager, Iterable, Iterator, Union
 import logging
 
 import utils
 import constants
 from db.db_handler import DatabaseHandler, DuplicateEmployeeID
-from db.db_data import PayPeriod, Shift, Employee
-from backend.generate_timesheet import PDFTimesheet
+from db.db_data import PayPeriod, Shift, Employee, HoursTotals
+from backend.render_mode import RenderMode
+from backend.page_cache import PageCache
+from backend import latency_stats
+from backend.exporters import ExportFormat
 
 
 _logger = logging.getLogger(__name__)
@@ -21,31 +28,85 @@ class CSVReadError(Exception):
     """
 
 
+class ReportCancelled(Exception):
+    """
+    Raised when generating a timesheet report is cancelled.
+    """
+
+
+@functools.lru_cache(maxsize=16)
+def _get_pay_period_dates(start_date: date) -> tuple[date, ...]:
+    return tuple(utils.next_date(start_date, i) for i in range(constants.PAY_PERIOD_DAYS))
+
+
+# Errors the callers handle themselves, so they aren't logged
+_EXPECTED_ERRORS = (CSVReadError, DuplicateEmployeeID, ReportCancelled)
+
+
 def error_handler(func):
     """
     Decorator that wraps a backend function in a try-except block to
-    log exceptions.
-    """
+    log exceptions. When latency_stats is enabled, also records how long
+    each call took and whether it raised.
 
+    Generator functions are wrapped as generators, so errors raised while
+    the items are consumed are logged too, and the time recorded runs until
+    the generator is exhausted or closed.
+    """
+    method = func.__qualname__
+
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            stats = latency_stats.active
+            start = time.perf_counter() if stats is not None else 0
+            failed = True
+
+            try:
+                yield from func(*args, **kwargs)
+                failed = False
+            except GeneratorExit: # Closed before it was exhausted
+                failed = False
+                raise
+            except _EXPECTED_ERRORS:
+                raise
+            except Exception as e:
+                _logger.exception(f"Caught an unexpected exception: {e}")
+                raise e
+            finally:
+                if stats is not None:
+                    stats.record(method, time.perf_counter() - start, failed)
+
+        return generator_wrapper
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
+        stats = latency_stats.active
+        start = time.perf_counter() if stats is not None else 0
+        failed = True
+
         try:
-            return func(*args, **kwargs)
-        except CSVReadError as e:
-            raise e
-        except DuplicateEmployeeID as e:
-            raise e
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        except _EXPECTED_ERRORS:
+            raise
         except Exception as e:
             _logger.exception(f"Caught an unexpected exception: {e}")
             raise e
+        finally:
+            if stats is not None:
+                stats.record(method, time.perf_counter() - start, failed)
 
     return wrapper
 
 
 class Backend:
-    def __init__(self, db_handler: DatabaseHandler):
+    def __init__(self, db_handler: DatabaseHandler, page_cache: PageCache = None):
         _logger.info("backend initializing...")
 
         self.db_handler = db_handler
+        self.page_cache = page_cache
 
         self.db_handler.create_settings_table()
         self.db_handler.create_shift_table()
@@ -114,8 +175,86 @@ class Backend:
     def get_employees(self) -> list[Employee]:
         return self.db_handler.get_employees()
 
+    @error_handler
+    def iter_employees(self) -> Iterator[Employee]:
+        """
+        Iterates over all employees without loading them all at once, for
+        streaming reports with save_timesheet.
+        """
+        yield from self.db_handler.iter_employees()
+
+    def _iter_hours_totals(
+        self,
+        db_handler: DatabaseHandler,
+        include: Callable[[Employee], bool] = None
+    ) -> Iterator[tuple[tuple, HoursTotals]]:
+        """
+        Iterates over each employee's profile, as (employee_id, first_name,
+        last_name, position, contract), and their hours totals for the pay
+        period.
+        """
+        from backend import exporters
+
+        pay_period = db_handler.get_pay_period()
+
+        if pay_period is None:
+            return
+
+        rows = db_handler.iter_hours_totals(pay_period)
+
+        if include is not None:
+            rows = exporters.filter_rows(rows, include)
+
+        profile = None
+        hours_totals = None
+
+        for row in rows:
+            if profile is None or row[0] != profile[0]:
+                if profile is not None:
+                    yield profile, hours_totals
+
+                profile = row[:exporters.PROFILE_COLUMN_COUNT]
+                hours_totals = HoursTotals(
+                    week_reg=[0] * constants.PAY_PERIOD_WEEKS,
+                    week_ot=[0] * constants.PAY_PERIOD_WEEKS
+                )
+
+            _, _, _, _, _, week, hours_reg, hours_ot = row
+
+            if week is not None:
+                hours_totals.week_reg[week] = hours_reg
+                hours_totals.week_ot[week] = hours_ot
+
+        if profile is not None:
+            yield profile, hours_totals
+
+    @error_handler
+    def get_hours_totals(
+        self,
+        include: Callable[[Employee], bool] = None
+    ) -> dict[str, HoursTotals]:
+        """
+        Get every employee's regular and overtime hours for each week of the
+        pay period, keyed by employee id in the order of get_employees. Summed
+        by the database in one query, without loading any shifts.
+
+        :param include: Optional. Called with each employee's profile, without
+            shifts. Only employees it returns True for are included.
+        """
+        return {
+            profile[0]: hours_totals
+            for profile, hours_totals in self._iter_hours_totals(self.db_handler, include)
+        }
+
+    @error_handler
+    def count_employees(self) -> int:
+        return self.db_handler.count_employees()
+
     @error_handler
     def generate_employees_from_csv(self, file_path: str) -> list[Employee]:
+        # Imported here, pandas is slow to import and only needed for CSVs
+        import pandas as pd
+
         employees = []
 
         try:
@@ -135,6 +274,8 @@ class Backend:
         def format_value(value) -> str:
             return str(value) if not pd.isna(value) else ""
 
+        pay_period = self.db_handler.get_pay_period() # Once, not per employee
+
         def row_to_employee(row) -> Employee:
             return Employee(
                 employee_id=format_value(row["Employee No"]),
@@ -142,43 +283,262 @@ class Backend:
                 last_name=format_value(row["Last Name"]),
                 position=format_value(row["Job Title"]),
                 contract=format_value(row["Contract"]),
-                shifts=self._get_default_shifts()
+                shifts=self._get_default_shifts(pay_period)
             )
 
         employees = df.apply(row_to_employee, axis=1).tolist()
 
         return employees
 
-    def _get_default_shifts(self) -> list[Shift]:
-        pay_period = self.db_handler.get_pay_period()
+    def _get_default_shifts(self, pay_period: Union[PayPeriod, None] = None) -> list[Shift]:
+        """
+        Get new default shifts for the pay period. If no pay period is given,
+        uses the current one. The shifts share their date objects with every
+        other employee's default shifts.
+        """
+        if pay_period is None:
+            pay_period = self.db_handler.get_pay_period()
 
         if pay_period is None:
             return []
 
         shifts = []
 
-        for i in range(constants.PAY_PERIOD_DAYS):
-            date = utils.next_date(pay_period.start_date, i)
-
-            if date.weekday() >= 5: # is a weekend
+        for shift_date in _get_pay_period_dates(pay_period.start_date):
+            if shift_date.weekday() >= 5: # is a weekend
                 shift = Shift(
-                    date=date,
+                    date=shift_date,
                     time_in=None,
                     time_out=None,
                     hours_reg=constants.DEFAULT_HOURS_WEEKEND,
                     hours_ot=constants.DEFAULT_HOURS_WEEKEND
                 )
             else:
-                shift = Shift(date=date)
+                shift = Shift(date=shift_date)
 
             shifts.append(shift)
 
         return shifts
 
     @error_handler
-    def save_timesheet(self, employees: list[Employee], file_path: str) -> None:
-        timesheet = PDFTimesheet(employees, filename=file_path)
-        timesheet.get_pdf().save()
+    def save_timesheet(
+        self,
+        employees: Iterable[Employee],
+        file_path: str,
+        progress_callback: Callable[[int, int], None] = None,
+        is_cancelled: Callable[[], bool] = None,
+        workers: int = 1,
+        render_mode: RenderMode = RenderMode.TABLE,
+        total: int = None
+    ) -> None:
+        """
+        Saves the timesheet report for the employees. The report is written to a
+        temporary file first, so a failed or cancelled report leaves no file behind.
+
+        For very large reports, pass an iterator of employees, such as
+        `iter_employees()`, with RenderMode.NATIVE. Pages are then written as
+        they are drawn, so memory use doesn't grow with the number of employees.
+
+        :param progress_callback: Optional. Called with the number of employees
+            drawn so far and the total.
+        :param is_cancelled: Optional. Polled as employees are drawn. If it
+            returns True, raises ReportCancelled.
+        :param workers: Optional. If greater than 1, the report is rendered in
+            shards across this many processes.
+        :param render_mode: Optional. How PDFTimesheet draws the pages. Serial
+            NATIVE reports reuse unchanged pages from the backend's page cache.
+        :param total: Optional. The number of employees, for progress when
+            `employees` is an iterator.
+        """
+        # Imported here, reportlab is slow to import and only needed for reports
+        from backend.generate_timesheet import PDFTimesheet
+        from backend import parallel_timesheet
+
+        handle_progress = self._get_progress_handler(progress_callback, is_cancelled)
+        tmp_path = f"{file_path}.part"
+
+        try:
+            if workers > 1:
+                parallel_timesheet.save_timesheet(
+                    list(employees),
+                    tmp_path,
+                    workers,
+                    progress_callback=handle_progress,
+                    render_mode=render_mode
+                )
+            else:
+                with self._open_page_cache(render_mode) as page_cache:
+                    timesheet = PDFTimesheet(
+                        employees,
+                        filename=tmp_path,
+                        progress_callback=handle_progress,
+                        render_mode=render_mode,
+                        total=total,
+                        page_cache=page_cache
+                    )
+                    timesheet.get_pdf().save()
+
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _open_page_cache(
+        self,
+        render_mode: RenderMode
+    ) -> ContextManager[Union[PageCache, None]]:
+        """
+        Opens the page cache for a report drawn on the calling thread, which
+        may be a worker's. Gives None if there is no cache or the render mode
+        can't use one.
+        """
+        if self.page_cache is None or render_mode != RenderMode.NATIVE:
+            return contextlib.nullcontext()
+
+        return self.page_cache.open_for_thread()
+
+    @error_handler
+    def save_employee_timesheets(
+        self,
+        employees: Iterable[Employee],
+        path: str,
+        as_zip: bool = False,
+        progress_callback: Callable[[int, int], None] = None,
+        is_cancelled: Callable[[], bool] = None,
+        workers: int = 1,
+        render_mode: RenderMode = RenderMode.TABLE,
+        total: int = None
+    ) -> None:
+        """
+        Saves a separate timesheet PDF for each employee, named by employee id,
+        into the directory at `path`, or into a zip archive at `path` if `as_zip`
+        is True. A zip archive is written to a temporary file first, so a failed
+        or cancelled report leaves no archive behind.
+
+        See save_timesheet for the other parameters.
+        """
+        from backend import employee_timesheets # Imported here, like PDFTimesheet
+
+        handle_progress = self._get_progress_handler(progress_callback, is_cancelled)
+
+        if not as_zip:
+            employee_timesheets.save_timesheets(
+                employees,
+                path,
+                workers=workers,
+                progress_callback=handle_progress,
+                render_mode=render_mode,
+                total=total
+            )
+            return
+
+        tmp_path = f"{path}.part"
+
+        try:
+            employee_timesheets.save_timesheets(
+                employees,
+                tmp_path,
+                as_zip=True,
+                workers=workers,
+                progress_callback=handle_progress,
+                render_mode=render_mode,
+                total=total
+            )
+
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @error_handler
+    def export_shifts(
+        self,
+        file_path: str,
+        export_format: ExportFormat = None,
+        include: Callable[[Employee], bool] = None
+    ) -> None:
+        """
+        Exports every employee's shifts, one row per shift, streaming them from
+        the database. Written to a temporary file first, like save_timesheet.
+        Can be called from any thread.
+
+        :param export_format: Optional. Defaults to the format matching the
+            file's extension.
+        :param include: Optional. Called with each employee's profile, without
+            shifts. Only employees it returns True for are exported.
+        :raises ValueError: If no format is given and the extension isn't one.
+        """
+        from backend import exporters
+
+        if export_format is None:
+            export_format = ExportFormat.from_path(file_path)
+
+        tmp_path = f"{file_path}.part"
+
+        try:
+            # Exports may run on a worker thread, which needs its own connection
+            with self.db_handler.open_for_thread() as db_handler:
+                rows = db_handler.iter_shift_rows()
+
+                if include is not None:
+                    rows = exporters.filter_rows(rows, include)
+
+                exporters.export_rows(rows, tmp_path, export_format)
+
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @error_handler
+    def export_hours_totals(
+        self,
+        file_path: str,
+        include: Callable[[Employee], bool] = None
+    ) -> None:
+        """
+        Exports every employee's weekly and pay period hours totals as CSV,
+        one row per employee. Written to a temporary file first, like
+        save_timesheet.
+
+        :param include: Optional. Like export_shifts, only employees it
+            returns True for are exported.
+        :raises ValueError: If the file isn't a CSV.
+        """
+        from backend import exporters
+
+        if ExportFormat.from_path(file_path) != ExportFormat.CSV:
+            raise ValueError("hours totals can only be exported as CSV")
+
+        tmp_path = f"{file_path}.part"
+
+        try:
+            with self.db_handler.open_for_thread() as db_handler, \
+                    open(tmp_path, "w", newline="", encoding="utf-8") as file:
+                exporters.write_totals_csv(self._iter_hours_totals(db_handler, include), file)
+
+            os.replace(tmp_path, file_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _get_progress_handler(
+        self,
+        progress_callback: Union[Callable[[int, int], None], None],
+        is_cancelled: Union[Callable[[], bool], None]
+    ) -> Callable[[int, int], None]:
+        """
+        Gets a progress callback for a report, that raises ReportCancelled
+        once `is_cancelled` returns True.
+        """
+        def handle_progress(drawn: int, total: int) -> None:
+            if is_cancelled is not None and is_cancelled():
+                raise ReportCancelled
+
+            if progress_callback is not None:
+                progress_callback(drawn, total)
+
+        return handle_progress
 
     @error_handler
     def create_blank_employee(self) -> Employee:
@@ -194,3 +554,13 @@ class Backend:
     def shutdown(self) -> None:
         _logger.info("backend shutting down")
         self.db_handler.close()
+
+        # After closing, so every query's last run is finished
+        if self.db_handler.query_stats is not None:
+            _logger.info(f"database queries: {self.db_handler.query_stats.format_report()}")
+
+        if latency_stats.active is not None:
+            _logger.info(f"backend latencies:\n{latency_stats.active.format_report()}")
+
+        if self.page_cache is not None:
+            self.page_cache.close()
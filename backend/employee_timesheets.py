@@ -0,0 +1,157 @@
+"""
+Saves a separate timesheet PDF for each employee, into a directory or a
+single zip archive.
+"""
+import io
+import os
+import re
+import zipfile
+import contextlib
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from db.db_data import Employee
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+
+
+# Employees rendered per task sent to a worker process
+BATCH_SIZE = 16
+
+# Batches submitted ahead per worker, bounding how many rendered PDFs wait in memory
+BATCHES_AHEAD_PER_WORKER = 2
+
+
+def _render_employee(employee: Employee, render_mode: RenderMode) -> bytes:
+    buffer = io.BytesIO()
+    PDFTimesheet([employee], filename=buffer, render_mode=render_mode).get_pdf().save()
+
+    return buffer.getvalue()
+
+
+def _render_batch(employees: list[Employee], render_mode: RenderMode) -> list[bytes]:
+    """
+    Renders a PDF for each employee in the batch. Runs in a worker process.
+    """
+    return [_render_employee(employee, render_mode) for employee in employees]
+
+
+def _iter_batches(employees: Iterable[Employee], batch_size: int) -> Iterator[list[Employee]]:
+    batch = []
+
+    for employee in employees:
+        batch.append(employee)
+
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+
+    if batch:
+        yield batch
+
+
+def _iter_rendered(
+    employees: Iterable[Employee],
+    workers: int,
+    render_mode: RenderMode
+) -> Iterator[tuple[Employee, bytes]]:
+    """
+    Renders each employee's PDF, yielding them in the original order.
+    """
+    if workers <= 1:
+        for employee in employees:
+            yield employee, _render_employee(employee, render_mode)
+        return
+
+    # Spawn rather than fork, the caller may be running other threads
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    pending = deque()
+
+    try:
+        for batch in _iter_batches(employees, BATCH_SIZE):
+            pending.append((batch, executor.submit(_render_batch, batch, render_mode)))
+
+            if len(pending) >= workers * BATCHES_AHEAD_PER_WORKER:
+                batch, future = pending.popleft()
+                yield from zip(batch, future.result())
+
+        while pending:
+            batch, future = pending.popleft()
+            yield from zip(batch, future.result())
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def get_file_name(employee: Employee, used_names: set[str]) -> str:
+    """
+    Gets the PDF file name for an employee from their employee id, and adds it
+    to `used_names`. Characters that aren't safe in file names are replaced,
+    and names already used are numbered.
+    """
+    stem = re.sub(r"[^\w.-]", "_", employee.employee_id).strip(".") or "employee"
+    name = f"{stem}.pdf"
+    count = 1
+
+    # Case-insensitive, for Windows file systems
+    while name.lower() in used_names:
+        count += 1
+        name = f"{stem}-{count}.pdf"
+
+    used_names.add(name.lower())
+
+    return name
+
+
+def save_timesheets(
+    employees: Iterable[Employee],
+    path: str,
+    as_zip: bool = False,
+    workers: int = 1,
+    progress_callback: Callable[[int, int], None] = None,
+    render_mode: RenderMode = RenderMode.TABLE,
+    total: int = None
+) -> None:
+    """
+    Saves a timesheet PDF for each employee, named by their employee id.
+
+    :param employees: The employees to save PDFs for.
+    :param path: The directory to save the PDFs in, created if needed, or the
+        name of the zip archive if `as_zip` is True.
+    :param as_zip: Optional. Whether to write the PDFs straight into a zip
+        archive instead of separate files.
+    :param workers: Optional. If greater than 1, PDFs are rendered in batches
+        across this many processes.
+    :param progress_callback: Optional. Called with the number of PDFs saved so
+        far and the total, after each PDF. If it raises, rendering is stopped
+        and the exception is propagated.
+    :param render_mode: Optional. How PDFTimesheet draws the pages.
+    :param total: Optional. The number of employees, for progress. Defaults to
+        `len(employees)`, or 0 if the employees have no length.
+    :raises ValueError: If any employee has fewer than constants.PAY_PERIOD shifts.
+    """
+    if total is None:
+        total = len(employees) if hasattr(employees, "__len__") else 0
+
+    used_names = set()
+
+    # Closed explicitly, so worker processes stop as soon as anything raises
+    with contextlib.closing(_iter_rendered(employees, workers, render_mode)) as rendered:
+        if as_zip:
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for i, (employee, pdf) in enumerate(rendered):
+                    archive.writestr(get_file_name(employee, used_names), pdf)
+
+                    if progress_callback is not None:
+                        progress_callback(i + 1, total)
+        else:
+            os.makedirs(path, exist_ok=True)
+
+            for i, (employee, pdf) in enumerate(rendered):
+                with open(os.path.join(path, get_file_name(employee, used_names)), "wb") as file:
+                    file.write(pdf)
+
+                if progress_callback is not None:
+                    progress_callback(i + 1, total)
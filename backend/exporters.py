@@ -0,0 +1,349 @@
+"""
+Streaming exporters for writing employees and their shifts as CSV, XLSX or
+JSON Lines, one row per shift.
+
+Rows are written as they are read, so memory use doesn't grow with the
+number of employees. Rows are as DatabaseHandler.iter_shift_rows yields them,
+with hours in hundredths, and hours are written like "8.50".
+"""
+import re
+import csv
+import json
+import zipfile
+from enum import Enum
+from functools import lru_cache
+from typing import Callable, Iterable, Iterator, TextIO, Union
+
+import utils
+import constants
+from db.db_data import Employee, HoursTotals
+
+
+# Same names as the employee import CSV, where they overlap
+EXPORT_COLUMNS = [
+    "Employee No", "First Name", "Last Name", "Job Title", "Contract",
+    "Date", "Time In", "Time Out", "Hours Reg.", "Hours OT"
+]
+
+JSONL_KEYS = [
+    "employee_id", "first_name", "last_name", "position", "contract",
+    "date", "time_in", "time_out", "hours_reg", "hours_ot"
+]
+
+PROFILE_COLUMN_COUNT = 5
+
+XLSX_MAX_ROWS = 1048576 # Per sheet, including the header row
+XLSX_WRITE_ROWS = 1000 # Rows buffered per write to the compressor
+
+
+class ExportFormat(Enum):
+    CSV = "csv"
+    XLSX = "xlsx"
+    JSONL = "jsonl"
+
+    @classmethod
+    def from_path(cls, file_path: str) -> "ExportFormat":
+        """
+        Gets the export format from a file's extension.
+
+        :raises ValueError: If the extension isn't one of the formats.
+        """
+        extension = file_path.rsplit(".", 1)[-1].lower()
+
+        try:
+            return cls(extension)
+        except ValueError:
+            raise ValueError(f"unsupported export file type: .{extension}")
+
+
+def filter_rows(
+    rows: Iterable[tuple],
+    include: Callable[[Employee], bool]
+) -> Iterator[tuple]:
+    """
+    Yields the rows of the employees `include` returns True for. It's called
+    once per employee, with their profile and no shifts. The rows must be
+    grouped by employee.
+    """
+    employee_id = None
+    included = False
+
+    for row in rows:
+        if row[0] != employee_id:
+            employee_id = row[0]
+            included = include(Employee(*row[:PROFILE_COLUMN_COUNT], shifts=[]))
+
+        if included:
+            yield row
+
+
+def _format_hours(hours) -> Union[str, None]:
+    return utils.format_hours(hours) if hours is not None else None
+
+
+def format_rows(rows: Iterable[tuple]) -> Iterator[tuple]:
+    """
+    Yields the rows with their hours formatted for display.
+    """
+    for row in rows:
+        yield row[:-2] + (_format_hours(row[-2]), _format_hours(row[-1]))
+
+
+def write_csv(rows: Iterable[tuple], file: TextIO) -> None:
+    writer = csv.writer(file)
+
+    writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(format_rows(rows)) # None is written as an empty field
+
+
+def get_totals_columns() -> list[str]:
+    columns = EXPORT_COLUMNS[:PROFILE_COLUMN_COUNT]
+
+    for week in range(1, constants.PAY_PERIOD_WEEKS + 1):
+        columns += [f"Week {week} Reg.", f"Week {week} OT"]
+
+    return columns + ["Period Reg.", "Period OT"]
+
+
+def write_totals_csv(totals: Iterable[tuple[tuple, HoursTotals]], file: TextIO) -> None:
+    """
+    Writes one row per employee, from their profile, as (employee_id,
+    first_name, last_name, position, contract), and their hours totals.
+    """
+    writer = csv.writer(file)
+
+    writer.writerow(get_totals_columns())
+
+    for profile, hours_totals in totals:
+        hours = []
+
+        for hours_reg, hours_ot in zip(hours_totals.week_reg, hours_totals.week_ot):
+            hours += [utils.format_hours(hours_reg), utils.format_hours(hours_ot)]
+
+        writer.writerow([
+            *profile,
+            *hours,
+            utils.format_hours(hours_totals.period_reg),
+            utils.format_hours(hours_totals.period_ot)
+        ])
+
+
+@lru_cache(maxsize=4096)
+def _json_value(value) -> str:
+    """
+    Encodes a shift value. Memoized, since most shifts share their values.
+    """
+    return json.dumps(value)
+
+
+def write_jsonl(rows: Iterable[tuple], file: TextIO) -> None:
+    """
+    Writes one JSON object per row. Values are written as they are stored,
+    except hours, which are formatted.
+    """
+    employee_id = None
+    profile = ""
+
+    for row in format_rows(rows):
+        # The profile part of the object is encoded once per employee
+        if row[0] != employee_id:
+            employee_id = row[0]
+            profile = "{" + ", ".join(
+                f"{json.dumps(key)}: {json.dumps(value)}"
+                for key, value in zip(JSONL_KEYS, row[:PROFILE_COLUMN_COUNT])
+            )
+
+        shift = ", ".join(
+            f'"{key}": {_json_value(value)}'
+            for key, value in zip(JSONL_KEYS[PROFILE_COLUMN_COUNT:], row[PROFILE_COLUMN_COUNT:])
+        )
+
+        file.write(f"{profile}, {shift}}}\n")
+
+
+# Characters XML 1.0 doesn't allow
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _escape_xml(text: str) -> str:
+    # Like xml.sax.saxutils.escape, which is slow to import
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _xlsx_string_cell(value: str) -> str:
+    text = _escape_xml(_INVALID_XML_CHARS.sub("", value))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+@lru_cache(maxsize=4096)
+def _xlsx_cell(value: Union[str, None]) -> str:
+    """
+    Formats a cell. Memoized, since most shifts share their values. Cells have
+    no reference, so they fill their row's columns in order.
+    """
+    if value is None:
+        return "<c/>"
+
+    return _xlsx_string_cell(value)
+
+
+@lru_cache(maxsize=4096)
+def _xlsx_hours_cell(hours: Union[int, None]) -> str:
+    """
+    Formats hundredths of an hour as a number cell, written as an exact decimal.
+    """
+    if hours is None:
+        return "<c/>"
+
+    return f"<c><v>{utils.format_hours(hours)}</v></c>"
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{overrides}</Types>'
+)
+
+_XLSX_SHEET_CONTENT_TYPE = (
+    '<Override PartName="/xl/worksheets/sheet{number}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+
+_XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>'
+)
+
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets></workbook>'
+)
+
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{rels}</Relationships>'
+)
+
+_XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+
+_XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def write_xlsx(rows: Iterable[tuple], file_path: str) -> None:
+    """
+    Writes the rows as a workbook, streaming each sheet straight into the
+    archive. Hours are written as numbers, so they can be summed. Rows past a
+    sheet's limit continue on a new sheet, each with the header row.
+    """
+    header = "".join(_xlsx_string_cell(column) for column in EXPORT_COLUMNS)
+
+    # Fast compression, sheets are repetitive enough to compress well anyway
+    with zipfile.ZipFile(
+        file_path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1
+    ) as archive:
+        sheet_count = 0
+        sheet = None
+        row_num = XLSX_MAX_ROWS
+
+        employee_id = None
+        profile = ""
+        buffer = []
+
+        def write_buffer() -> None:
+            sheet.write("".join(buffer).encode("utf-8"))
+            buffer.clear()
+
+        try:
+            for row in rows:
+                if row_num == XLSX_MAX_ROWS:
+                    if sheet is not None:
+                        buffer.append(_XLSX_SHEET_END)
+                        write_buffer()
+                        sheet.close()
+
+                    sheet_count += 1
+                    sheet = archive.open(
+                        f"xl/worksheets/sheet{sheet_count}.xml", "w", force_zip64=True
+                    )
+                    sheet.write(
+                        (_XLSX_SHEET_START + f'<row r="1">{header}</row>').encode("utf-8")
+                    )
+                    row_num = 1
+
+                # The profile cells are formatted once per employee
+                if row[0] != employee_id:
+                    employee_id = row[0]
+                    profile = "".join(
+                        _xlsx_string_cell(value) if value is not None else "<c/>"
+                        for value in row[:PROFILE_COLUMN_COUNT]
+                    )
+
+                _, _, _, _, _, shift_date, time_in, time_out, hours_reg, hours_ot = row
+                shift = (
+                    _xlsx_cell(shift_date) + _xlsx_cell(time_in) + _xlsx_cell(time_out)
+                    + _xlsx_hours_cell(hours_reg) + _xlsx_hours_cell(hours_ot)
+                )
+
+                row_num += 1
+                buffer.append(f'<row r="{row_num}">{profile}{shift}</row>')
+
+                if len(buffer) >= XLSX_WRITE_ROWS:
+                    write_buffer()
+
+            # A workbook needs at least one sheet
+            if sheet is None:
+                sheet_count = 1
+                sheet = archive.open("xl/worksheets/sheet1.xml", "w")
+                sheet.write((_XLSX_SHEET_START + f'<row r="1">{header}</row>').encode("utf-8"))
+
+            buffer.append(_XLSX_SHEET_END)
+            write_buffer()
+        finally:
+            if sheet is not None:
+                sheet.close()
+
+        numbers = range(1, sheet_count + 1)
+
+        archive.writestr("[Content_Types].xml", _XLSX_CONTENT_TYPES.format(
+            overrides="".join(_XLSX_SHEET_CONTENT_TYPE.format(number=n) for n in numbers)
+        ))
+        archive.writestr("_rels/.rels", _XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(sheets="".join(
+            f'<sheet name="Shifts{f" {n}" if n > 1 else ""}" sheetId="{n}" r:id="rId{n}"/>'
+            for n in numbers
+        )))
+        archive.writestr("xl/_rels/workbook.xml.rels", _XLSX_WORKBOOK_RELS.format(rels="".join(
+            f'<Relationship Id="rId{n}" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+            f'Target="worksheets/sheet{n}.xml"/>'
+            for n in numbers
+        )))
+
+
+def export_rows(rows: Iterable[tuple], file_path: str, export_format: ExportFormat) -> None:
+    """
+    Writes the rows to the file in the export format.
+    """
+    if export_format == ExportFormat.XLSX:
+        write_xlsx(rows, file_path)
+        return
+
+    # Rows are small, a large buffer means fewer writes
+    with open(file_path, "w", newline="", encoding="utf-8", buffering=1024 * 1024) as file:
+        if export_format == ExportFormat.CSV:
+            write_csv(rows, file)
+        else:
+            write_jsonl(rows, file)
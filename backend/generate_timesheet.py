@@ -1,22 +1,60 @@
 """
 PDFTimesheet Class for creating a PDF timesheet report.
 """
-from datetime import datetime
+from datetime import date, datetime, time
 from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Callable, Iterable, Union
 
 from reportlab import platypus
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors, pagesizes, units
-from reportlab.pdfbase import pdfmetrics
 
+import utils
 import constants
 from db.db_data import Employee, Shift
+from backend import timesheet_layout
+from backend.native_pdf import NativePDFWriter, format_number
+from backend.page_cache import PageCache, get_employee_key
+from backend.render_mode import RenderMode
+from backend.timesheet_layout import (
+    PAGE_WIDTH,
+    PAGE_TOP,
+    FONT,
+    LABEL_X,
+    LABELLED_TEXT_X,
+    TIMESHEET_X,
+    PDFPageLayout,
+    PDFText,
+    PDFTextSlot,
+    string_width
+)
 
 
-PAGE_WIDTH, PAGE_HEIGHT = pagesizes.A4
-FONT = "Helvetica"
 DEFAULT_FILENAME = "timesheet.pdf"
 
+# (row, col) of the timesheet table cells that change between employees
+TIMESHEET_VARIABLE_CELLS = [
+    (row, col) for row in range(2, 9) for col in range(6)
+] + [(9, 4), (9, 5)]
+
+
+@lru_cache(maxsize=4096)
+def _format_date(shift_date: date) -> tuple[str, str]:
+    """
+    Formats a shift's date as its day and date columns. Memoized, since every
+    employee has shifts on the same dates.
+    """
+    return shift_date.strftime('%A')[:3], shift_date.strftime(constants.DATE_FORMAT)
+
+
+@lru_cache(maxsize=4096)
+def _format_time(shift_time: Union[time, None]) -> str:
+    """
+    Formats a shift's time in or out. Memoized, since most shifts share times.
+    """
+    return shift_time.strftime("%I:%M %p") if shift_time else "--"
+
 
 @dataclass
 class PDFTimesheetTable:
@@ -30,6 +68,16 @@ class PDFTimesheetTable:
     rows: list[str]
 
 
+@dataclass
+class PDFPageTemplate:
+    """
+    A form holding the static parts of a page, and the slots for the
+    variable text in drawing order.
+    """
+    form_name: str
+    slots: list[PDFTextSlot]
+
+
 class PDFTimesheet:
     """
     Creates a PDF timesheet report for a list of employees.
@@ -37,23 +85,72 @@ class PDFTimesheet:
 
     def __init__(
         self,
-        employees: list[Employee],
-        filename: str = DEFAULT_FILENAME
+        employees: Iterable[Employee],
+        filename: Union[str, BinaryIO] = DEFAULT_FILENAME,
+        progress_callback: Callable[[int, int], None] = None,
+        page_offset: int = 0,
+        render_mode: RenderMode = RenderMode.TABLE,
+        total: int = None,
+        page_cache: PageCache = None
     ) -> None:
         """
         Creates the PDF.
 
-        :param employees: The employees to include in the PDF.
-        :param filename: The name of the PDF.
-        :raises ValueError: If any employee has fewer than constants.PAY_PERIOD shifts.
+        :param employees: The employees to include in the PDF. Can be any
+            iterable. In NATIVE mode each page is written to the file as soon
+            as it is drawn, so an iterator of employees keeps memory bounded.
+            The other modes keep every page in memory until the PDF is saved.
+        :param filename: The name of the PDF, or a binary file object.
+        :param progress_callback: Optional. Called with the number of employees
+            drawn so far and the total, after each employee's page.
+        :param page_offset: Optional. The number of report pages before this
+            PDF's first page, for rendering part of a larger report. The header
+            is only drawn when this is 0.
+        :param render_mode: Optional. How pages are drawn. All modes produce
+            the same layout.
+        :param total: Optional. The number of employees, for progress. Defaults
+            to `len(employees)`, or 0 if the employees have no length.
+        :param page_cache: Optional. Only for NATIVE mode. Employees whose
+            pages are cached aren't drawn again, and new pages are cached.
+        :raises ValueError: If any employee has fewer than constants.PAY_PERIOD shifts,
+            or if a page cache is given for a mode other than NATIVE.
         """
-        self._pdf = canvas.Canvas(filename, pagesize=pagesizes.A4)
-        self._pdf.setStrokeColorRGB(0, 0, 0)
-        self._y = PAGE_HEIGHT - units.inch
-
-        self._draw_header()
-        self._y -= (1.5 * units.cm)
-        self._draw_employees(employees)
+        if page_cache is not None and render_mode != RenderMode.NATIVE:
+            raise ValueError("a page cache needs RenderMode.NATIVE")
+
+        self._progress_callback = progress_callback
+        self._page_offset = page_offset
+        self._render_mode = render_mode
+        self._page_cache = page_cache
+        self._page_templates = {} # Keyed by the tables' column widths
+        self._page_layouts = {} # Keyed by the tables' column widths
+        self._native_contents = {} # Keyed by the tables' column widths
+        self._native_header = "" # Written with the next page in NATIVE mode
+        self._texts = [] # Drawn together when the page is finished
+        self._y = PAGE_TOP
+
+        if render_mode == RenderMode.NATIVE:
+            # Cached pages may use any of the report's fonts
+            self._pdf = NativePDFWriter(filename, fonts=[FONT, f"{FONT}-Bold"])
+        else:
+            self._pdf = canvas.Canvas(filename, pagesize=pagesizes.A4)
+            self._pdf.setStrokeColorRGB(0, 0, 0)
+
+        if total is None:
+            total = len(employees) if hasattr(employees, "__len__") else 0
+
+        try:
+            if page_offset == 0:
+                self._draw_header()
+                self._y -= (1.5 * units.cm)
+
+            self._draw_employees(employees, total)
+        except BaseException:
+            # A NATIVE PDF's file is already open, and won't be saved
+            if render_mode == RenderMode.NATIVE:
+                self._pdf.close()
+
+            raise
 
 
     def _draw_text(
@@ -63,43 +160,64 @@ class PDFTimesheet:
         y: int,
         font: str = FONT,
         font_size: int = 12,
+        centred: bool = False
     ) -> None:
         """
-        Draws text on the current page.
+        Draws text on the current page. The text is drawn with the rest of
+        the page's text by `_flush_text`.
         """
-        text_obj = self._pdf.beginText(x, y)
-        text_obj.setFont(font, font_size)
-        text_obj.textLine(text)
+        self._texts.append(PDFText(x, y, text, font, font_size, centred))
 
-        self._pdf.drawText(text_obj)
 
+    def _flush_text(self) -> None:
+        """
+        Draws the text added with `_draw_text` since the last flush.
+        """
+        if self._texts:
+            self._draw_texts(self._texts)
+            self._texts = []
 
-    def _get_x_for_centered_text(self, text: str, font_size: int) -> int:
+
+    def _draw_texts(self, texts: list[PDFText]) -> None:
         """
-        Calculates the x-coordinate that would center the text in the PDF.
+        Draws the texts with one text object, only switching fonts when needed.
         """
-        text_width = pdfmetrics.stringWidth(text, FONT, font_size)
-        x = (PAGE_WIDTH - text_width) / 2.0
+        text_obj = self._pdf.beginText()
+        font = None
+
+        for text in texts:
+            if (text.font, text.font_size) != font:
+                font = (text.font, text.font_size)
+                text_obj.setFont(text.font, text.font_size)
 
-        return x
+            x = text.x
+
+            if text.centred:
+                x -= string_width(text.text, text.font, text.font_size) / 2.0
+
+            text_obj.setTextOrigin(x, text.y)
+            text_obj.textOut(text.text)
+
+        self._pdf.drawText(text_obj)
 
 
     def _add_page_number(self):
         """
         Adds the current page number to the PDF.
         """
-        page_num = str(self._pdf.getPageNumber())
+        page_num = str(self._page_offset + self._pdf.getPageNumber())
 
         self._draw_text(
             text=page_num,
-            x=self._get_x_for_centered_text(page_num, font_size=12),
-            y=units.inch * 0.5
+            x=PAGE_WIDTH / 2.0,
+            y=units.inch * 0.5,
+            centred=True
         )
 
 
-    def _draw_header_title(self) -> None:
+    def _create_header_title_table(self) -> platypus.Table:
         """
-        Draws the <COMPANY NAME> header box on the page.
+        Creates the <COMPANY NAME> header box.
         """
         text = constants.COMPANY_NAME
         font_size = 14
@@ -120,15 +238,12 @@ class PDFTimesheet:
             ('LINEABOVE', (0, 0), (0, 0), 1, colors.black),  # Top border 1 thick
         ])
 
-        table_width, table_height = table.wrapOn(self._pdf, 0, 0)
-        table.drawOn(self._pdf, x=(PAGE_WIDTH - table_width) / 2.0, y=self._y - table_height)
-
-        self._y -= table_height
+        return table
 
 
-    def _draw_header_subtitle(self) -> None:
+    def _create_header_subtitle_table(self) -> platypus.Table:
         """
-        Draws the CREW TIMESHEET header box on the page.
+        Creates the CREW TIMESHEET header box.
         """
         text = "CREW TIMESHEET"
         font_size = 12
@@ -149,8 +264,28 @@ class PDFTimesheet:
             ('LINEBELOW', (0, 0), (0, 0), 1, colors.black),  # Bottom border 1 thick
         ])
 
-        table_width, table_height = table.wrapOn(self._pdf, 0, 0)
-        table.drawOn(self._pdf, x=(PAGE_WIDTH - table_width) / 2.0, y=self._y - table_height)
+        return table
+
+
+    def _draw_header_box(self, table: platypus.Table) -> None:
+        """
+        Draws a header box centred on the page.
+        """
+        if self._render_mode in (RenderMode.CANVAS, RenderMode.NATIVE):
+            table_width, table_height = timesheet_layout.get_table_size(table)
+
+            layout = PDFPageLayout()
+            timesheet_layout.add_table(
+                layout, table, x=(PAGE_WIDTH - table_width) / 2.0, top_y=self._y
+            )
+
+            if self._render_mode == RenderMode.NATIVE:
+                self._native_header += self._format_native_layout(layout) + "\n"
+            else:
+                self._draw_page_layout(layout, [])
+        else:
+            table_width, table_height = table.wrapOn(self._pdf, 0, 0)
+            table.drawOn(self._pdf, x=(PAGE_WIDTH - table_width) / 2.0, y=self._y - table_height)
 
         self._y -= table_height
 
@@ -159,11 +294,11 @@ class PDFTimesheet:
         """
         Draws the header on the PDF. This should appear only on the first page.
         """
-        self._draw_header_title()
+        self._draw_header_box(self._create_header_title_table())
 
         self._y -= (0.3 * units.cm)
 
-        self._draw_header_subtitle()
+        self._draw_header_box(self._create_header_subtitle_table())
 
 
     def _draw_labelled_text(
@@ -180,7 +315,7 @@ class PDFTimesheet:
         """
         self._draw_text(
             text=label,
-            x=units.inch,
+            x=LABEL_X,
             y=self._y,
             font=font if not bold else f"{font}-Bold",
             font_size=font_size
@@ -188,37 +323,65 @@ class PDFTimesheet:
 
         self._draw_text(
             text=text,
-            x=units.inch + (units.inch * 1.95),
+            x=LABELLED_TEXT_X,
             y=self._y,
             font=font,
             font_size=font_size
         )
 
 
-    def _draw_employees(self, employees: list[Employee]):
+    def _draw_employees(self, employees: Iterable[Employee], total: int):
         """
-        Draws each employee's timesheet in the order they appear in the list.
+        Draws each employee's timesheet in the order they are iterated.
         There will be one employee per page.
         """
-        for employee in employees:
-            self._draw_employee(employee)
+        for i, employee in enumerate(employees):
+            self._check_shifts(employee)
 
-            self._add_page_number()
-            self._pdf.showPage() # Move to next page
-            
-            self._y = PAGE_HEIGHT - units.inch
+            if self._render_mode == RenderMode.NATIVE:
+                self._write_native_page(employee)
+            else:
+                if self._render_mode == RenderMode.TEMPLATE:
+                    self._draw_employee_from_template(employee)
+                elif self._render_mode == RenderMode.CANVAS:
+                    self._draw_employee_from_layout(employee)
+                else:
+                    self._draw_employee(employee)
 
+                self._add_page_number()
+                self._flush_text()
+                self._pdf.showPage() # Move to next page
 
-    def _draw_employee(self, employee: Employee) -> None:
-        """
-        Draws an employee's details and timesheet tables on the current page.
-        """
+            self._y = PAGE_TOP
+
+            if self._progress_callback is not None:
+                self._progress_callback(i + 1, total)
+
+        # Text without an employee page to flush it, like an empty report's header
+        if self._render_mode != RenderMode.NATIVE:
+            self._flush_text()
+
+        # A header without any employees still gets its page, as with a canvas
+        if self._native_header:
+            self._pdf.add_page(self._native_header)
+            self._native_header = ""
+
+        if self._page_cache is not None:
+            self._page_cache.flush()
+
+
+    def _check_shifts(self, employee: Employee) -> None:
         if len(employee.shifts) != constants.PAY_PERIOD_DAYS:
             raise ValueError(
                 f"expected {constants.PAY_PERIOD_DAYS} shifts but " \
                 f"got {len(employee.shifts)}"
             )
 
+
+    def _draw_employee(self, employee: Employee) -> None:
+        """
+        Draws an employee's details and timesheet tables on the current page.
+        """
         self._draw_labelled_text("Employee", f"{employee.first_name} {employee.last_name}")
 
         self._y -= units.cm
@@ -242,7 +405,7 @@ class PDFTimesheet:
         """
         Creates a PDFTimesheetTable from a list of shifts.
         """
-        week_ending = shifts[-1].date.strftime(constants.DATE_FORMAT)
+        _, week_ending = _format_date(shifts[-1].date)
 
         rows = []
 
@@ -253,22 +416,23 @@ class PDFTimesheet:
         total_hours_ot = 0
 
         def shift_to_row(shift: Shift) -> list[str]:
-            day = shift.date.strftime('%A')[:3]
-            date = shift.date.strftime(constants.DATE_FORMAT)
-            time_in = shift.time_in.strftime("%I:%M %p") if shift.time_in else "--"
-            time_out = shift.time_out.strftime("%I:%M %p") if shift.time_out else "--"
-            hours_reg = shift.hours_reg
-            hours_ot = shift.hours_ot
+            day, date = _format_date(shift.date)
+            time_in = _format_time(shift.time_in)
+            time_out = _format_time(shift.time_out)
+            hours_reg = utils.format_hours(shift.hours_reg)
+            hours_ot = utils.format_hours(shift.hours_ot)
 
             return [day, date, time_in, time_out, hours_reg, hours_ot]
 
         for shift in shifts:
             rows.append(shift_to_row(shift))
 
-            total_hours_reg += float(shift.hours_reg)
-            total_hours_ot += float(shift.hours_ot)
+            total_hours_reg += shift.hours_reg
+            total_hours_ot += shift.hours_ot
 
-        totals_row = ["", "", "", "Total:", "{:.2f}".format(total_hours_reg), "{:.2f}".format(total_hours_ot)]
+        totals_row = [
+            "", "", "", "Total:", utils.format_hours(total_hours_reg), utils.format_hours(total_hours_ot)
+        ]
 
         rows.append(totals_row)
 
@@ -285,7 +449,24 @@ class PDFTimesheet:
 
         self._y -= units.cm
 
-        table = platypus.Table(pdf_table.rows)
+        table = self._create_timesheet_table(pdf_table.rows)
+
+        _, table_height = table.wrapOn(self._pdf, 0, 0)
+        table.drawOn(self._pdf, TIMESHEET_X, self._y - table_height)
+
+        self._y -= table_height
+
+
+    def _create_timesheet_table(
+        self,
+        rows: list[list[str]],
+        col_widths: list[float] = None,
+        row_heights: list[float] = None
+    ) -> platypus.Table:
+        """
+        Creates the styled platypus table for a week of a timesheet.
+        """
+        table = platypus.Table(rows, colWidths=col_widths, rowHeights=row_heights)
 
         table.setStyle([
             ('SPAN', (2, 0), (3, 0)),		# "Time" spans two columns
@@ -305,14 +486,339 @@ class PDFTimesheet:
             ('BOX', (0, 1), (1, 2), 1, colors.black),
         ])
 
+        return table
+
+
+    def _get_column_signature(self, pdf_table: PDFTimesheetTable) -> tuple[float]:
+        """
+        Gets the widest variable text in each column. Tables with the same
+        signature have the same layout.
+        """
+        widths = [0.0] * 6
+
+        for row, col in TIMESHEET_VARIABLE_CELLS:
+            text_width = string_width(pdf_table.rows[row][col], FONT, 12)
+            widths[col] = max(widths[col], text_width)
+
+        return tuple(widths)
+
+
+    def _draw_employee_from_template(self, employee: Employee) -> None:
+        """
+        Draws an employee's page using the page template for its layout,
+        creating the template first if needed.
+        """
+        pdf_tables = [
+            self._create_pdf_timesheet_table(employee.shifts[0:7]),
+            self._create_pdf_timesheet_table(employee.shifts[7:14])
+        ]
+
+        key = tuple(self._get_column_signature(pdf_table) for pdf_table in pdf_tables)
+
+        if key not in self._page_templates:
+            self._page_templates[key] = self._create_page_template(pdf_tables)
+
+        template = self._page_templates[key]
+        values = self._get_page_values(employee, pdf_tables)
+
+        # Templates are drawn for a page without the header
+        y_offset = self._y - PAGE_TOP
+
+        self._pdf.saveState()
+        self._pdf.translate(0, y_offset)
+        self._pdf.doForm(template.form_name)
+        self._pdf.restoreState()
+
+        for slot, value in zip(template.slots, values):
+            self._draw_text(
+                value, slot.x, slot.y + y_offset, slot.font, slot.font_size, slot.centred
+            )
+
+
+    def _get_page_values(
+        self,
+        employee: Employee,
+        pdf_tables: list[PDFTimesheetTable]
+    ) -> list[str]:
+        """
+        Gets the variable text of an employee's page, in the order of the
+        slots of a page template or layout.
+        """
+        values = [
+            f"{employee.first_name} {employee.last_name}",
+            employee.position,
+            employee.contract
+        ]
+
+        for pdf_table in pdf_tables:
+            values.append(pdf_table.week_ending)
+            values.extend(pdf_table.rows[row][col] for row, col in TIMESHEET_VARIABLE_CELLS)
+
+        return values
+
+
+    def _create_page_template(self, pdf_tables: list[PDFTimesheetTable]) -> PDFPageTemplate:
+        """
+        Draws the labels and timesheet grids for the tables' layout into a new
+        form. Mirrors the layout of `_draw_employee`.
+        """
+        template = PDFPageTemplate(f"page{len(self._page_templates)}", [])
+
+        y = self._y
+        self._y = PAGE_TOP
+
+        # Keep the current page's text out of the form
+        texts, self._texts = self._texts, []
+
+        self._pdf.beginForm(template.form_name)
+
+        for label in ["Employee", "Job Title", "Contract"]:
+            self._draw_text(label, x=LABEL_X, y=self._y)
+            template.slots.append(PDFTextSlot(LABELLED_TEXT_X, self._y, FONT, 12))
+
+            self._y -= units.cm
+
+        self._y -= (0.5 * units.cm)
+
+        for i, pdf_table in enumerate(pdf_tables):
+            if i > 0:
+                self._y -= units.cm
+
+            self._draw_timesheet_template(pdf_table, template.slots)
+
+        self._flush_text()
+        self._pdf.endForm()
+
+        self._y = y
+        self._texts = texts
+
+        return template
+
+
+    def _draw_timesheet_template(
+        self,
+        pdf_table: PDFTimesheetTable,
+        slots: list[PDFTextSlot]
+    ) -> None:
+        """
+        Draws a timesheet table without its variable text, adding a slot for
+        each variable cell. Mirrors `_draw_timesheet`.
+        """
+        self._draw_text("Week Ending", x=LABEL_X, y=self._y, font=f"{FONT}-Bold")
+        slots.append(PDFTextSlot(LABELLED_TEXT_X, self._y, FONT, 12))
+
+        self._y -= units.cm
+
+        # Measure the table with its text, then draw it without
+        table = self._create_timesheet_table(pdf_table.rows)
         _, table_height = table.wrapOn(self._pdf, 0, 0)
-        table.drawOn(self._pdf, units.inch * 1.5, self._y - table_height)
+
+        blank_rows = [list(row) for row in pdf_table.rows]
+
+        for row, col in TIMESHEET_VARIABLE_CELLS:
+            blank_rows[row][col] = ""
+
+        blank_table = self._create_timesheet_table(
+            blank_rows, col_widths=table._colWidths, row_heights=table._rowHeights
+        )
+        blank_table.wrapOn(self._pdf, 0, 0)
+
+        x = TIMESHEET_X
+        y = self._y - table_height
+
+        blank_table.drawOn(self._pdf, x, y)
+
+        # Same text position as platypus for CENTER and MIDDLE aligned cells
+        for row, col in TIMESHEET_VARIABLE_CELLS:
+            cell_x, cell_y, cell_width, cell_height = table._spanRects[col, row]
+            style = table._cellStyles[row][col]
+
+            slots.append(PDFTextSlot(
+                x=x + cell_x + (cell_width + style.leftPadding - style.rightPadding) / 2.0,
+                y=y + cell_y + (
+                    style.bottomPadding + cell_height - style.topPadding + style.leading
+                ) / 2.0 - style.fontsize,
+                font=style.fontname,
+                font_size=style.fontsize,
+                centred=True
+            ))
 
         self._y -= table_height
 
 
-    def get_pdf(self) -> canvas.Canvas:
+    def _draw_employee_from_layout(self, employee: Employee) -> None:
+        """
+        Draws an employee's page with raw canvas calls, using the page layout
+        for its tables, creating the layout first if needed.
+        """
+        pdf_tables = [
+            self._create_pdf_timesheet_table(employee.shifts[0:7]),
+            self._create_pdf_timesheet_table(employee.shifts[7:14])
+        ]
+
+        key = tuple(self._get_column_signature(pdf_table) for pdf_table in pdf_tables)
+
+        if key not in self._page_layouts:
+            self._page_layouts[key] = self._create_page_layout(pdf_tables)
+
+        # Layouts are for a page without the header
+        self._draw_page_layout(
+            self._page_layouts[key],
+            self._get_page_values(employee, pdf_tables),
+            y_offset=self._y - PAGE_TOP
+        )
+
+
+    def _create_page_layout(self, pdf_tables: list[PDFTimesheetTable]) -> PDFPageLayout:
+        """
+        Computes the layout of a page with the tables' column widths.
+        Mirrors the layout of `_draw_employee`.
+        """
+        layout = PDFPageLayout()
+        y = PAGE_TOP
+
+        for label in ["Employee", "Job Title", "Contract"]:
+            layout.texts.append(PDFText(LABEL_X, y, label, FONT, 12))
+            layout.slots.append(PDFTextSlot(LABELLED_TEXT_X, y, FONT, 12))
+
+            y -= units.cm
+
+        y -= (0.5 * units.cm)
+
+        for i, pdf_table in enumerate(pdf_tables):
+            if i > 0:
+                y -= units.cm
+
+            layout.texts.append(PDFText(LABEL_X, y, "Week Ending", f"{FONT}-Bold", 12))
+            layout.slots.append(PDFTextSlot(LABELLED_TEXT_X, y, FONT, 12))
+
+            y -= units.cm
+
+            _, table_height = timesheet_layout.add_table(
+                layout,
+                self._create_timesheet_table(pdf_table.rows),
+                x=TIMESHEET_X,
+                top_y=y,
+                variable_cells=TIMESHEET_VARIABLE_CELLS
+            )
+
+            y -= table_height
+
+        return layout
+
+
+    def _draw_page_layout(
+        self,
+        layout: PDFPageLayout,
+        values: list[str],
+        y_offset: float = 0
+    ) -> None:
+        """
+        Draws a page layout with the values for its slots, moved up by `y_offset`.
+        Lines are drawn as one path per line width, and the text is drawn with
+        the rest of the page's text.
+        """
+        self._pdf.saveState()
+        self._pdf.translate(0, y_offset)
+
+        # Same line style platypus tables use
+        self._pdf.setLineCap(1)
+        self._pdf.setLineJoin(1)
+
+        lines_by_width = {}
+
+        for line in layout.lines:
+            lines_by_width.setdefault(line.width, []).append(
+                (line.x0, line.y0, line.x1, line.y1)
+            )
+
+        for line_width, lines in lines_by_width.items():
+            self._pdf.setLineWidth(line_width)
+            self._pdf.lines(lines)
+
+        self._pdf.restoreState()
+
+        for text in layout.texts:
+            self._draw_text(
+                text.text, text.x, text.y + y_offset, text.font, text.font_size, text.centred
+            )
+
+        for slot, value in zip(layout.slots, values):
+            self._draw_text(
+                value, slot.x, slot.y + y_offset, slot.font, slot.font_size, slot.centred
+            )
+
+
+    def _format_native_layout(self, layout: PDFPageLayout) -> str:
+        """
+        Formats the lines and static text of a layout as content stream operators.
+        """
+        return self._pdf.format_lines(layout.lines) + "\n" + self._pdf.format_text([
+            (text.x, text.y, text.text, text.font, text.font_size, text.centred)
+            for text in layout.texts
+        ])
+
+
+    def _write_native_page(self, employee: Employee) -> None:
+        """
+        Writes an employee's page with NativePDFWriter, reusing the page's
+        content from the page cache if it's there.
+        """
+        if self._page_cache is not None:
+            key = get_employee_key(employee)
+            content = self._page_cache.get(key)
+
+            if content is None:
+                content = self._format_native_page(employee)
+                self._page_cache.put(key, content)
+        else:
+            content = self._format_native_page(employee)
+
+        page_num = str(self._page_offset + self._pdf.get_page_count() + 1)
+
+        contents = [
+            self._native_header,
+            # Pages are formatted without the header
+            f"q 1 0 0 1 0 {format_number(self._y - PAGE_TOP)} cm",
+            content,
+            "Q",
+            self._pdf.format_text([
+                (PAGE_WIDTH / 2.0, units.inch * 0.5, page_num, FONT, 12, True)
+            ])
+        ]
+
+        self._pdf.add_page("\n".join(contents))
+        self._native_header = ""
+
+
+    def _format_native_page(self, employee: Employee) -> str:
+        """
+        Formats an employee's page content, without the header or page number.
+        The static content of each layout is formatted once, and only the
+        values are formatted per page.
+        """
+        pdf_tables = [
+            self._create_pdf_timesheet_table(employee.shifts[0:7]),
+            self._create_pdf_timesheet_table(employee.shifts[7:14])
+        ]
+
+        key = tuple(self._get_column_signature(pdf_table) for pdf_table in pdf_tables)
+
+        if key not in self._page_layouts:
+            self._page_layouts[key] = self._create_page_layout(pdf_tables)
+            self._native_contents[key] = self._format_native_layout(self._page_layouts[key])
+
+        layout = self._page_layouts[key]
+        values = self._get_page_values(employee, pdf_tables)
+
+        return self._native_contents[key] + "\n" + self._pdf.format_text([
+            (slot.x, slot.y, value, slot.font, slot.font_size, slot.centred)
+            for slot, value in zip(layout.slots, values)
+        ])
+
+
+    def get_pdf(self) -> Union[canvas.Canvas, NativePDFWriter]:
         """
-        Get the PDF.
+        Get the PDF. Both kinds of PDF are written with `save()`.
         """
         return self._pdf
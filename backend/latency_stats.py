@@ -0,0 +1,143 @@
+"""
+LatencyStats Class for recording how long Backend methods take.
+
+Backend methods record into `active` through error_handler. Recording is off
+until enable() is called, and then costs a couple of microseconds per call.
+"""
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Union
+
+
+# Histogram buckets per doubling of latency, so each percentile is within
+# about 9% of the true value
+BUCKETS_PER_DOUBLING = 8
+
+PERCENTILES = [50, 95, 99]
+
+
+@dataclass
+class MethodLatency:
+    """
+    Latency histogram and counts for one method
+    """
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+    buckets: dict[int, int] = field(default_factory=dict) # Bucket index, calls
+
+    def get_percentile(self, percentile: float) -> float:
+        """
+        Get the latency in seconds that `percentile` percent of calls were
+        faster than, as the upper bound of its bucket.
+        """
+        if self.calls == 0:
+            return 0
+
+        rank = math.ceil(self.calls * percentile / 100)
+        seen = 0
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+
+            if seen >= rank:
+                return min(_get_bucket_bound(index), self.max_seconds)
+
+        return self.max_seconds
+
+
+class LatencyStats:
+    """
+    Per-method latency histograms, call counts and error counts. Safe to
+    record into from multiple threads.
+    """
+
+    def __init__(self):
+        self.methods: dict[str, MethodLatency] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, seconds: float, failed: bool = False) -> None:
+        index = _get_bucket_index(seconds)
+
+        with self._lock:
+            latency = self.methods.get(method)
+
+            if latency is None:
+                latency = self.methods[method] = MethodLatency()
+
+            latency.calls += 1
+            latency.errors += failed
+            latency.total_seconds += seconds
+            latency.max_seconds = max(latency.max_seconds, seconds)
+            latency.buckets[index] = latency.buckets.get(index, 0) + 1
+
+    def to_dict(self) -> dict:
+        """
+        Get the counts and percentiles of each method, by most total time
+        first. Times are in milliseconds.
+        """
+        with self._lock:
+            methods = sorted(
+                self.methods.items(), key=lambda item: item[1].total_seconds, reverse=True
+            )
+
+            return {
+                method: {
+                    "calls": latency.calls,
+                    "errors": latency.errors,
+                    "total_ms": 1000 * latency.total_seconds,
+                    **{
+                        f"p{percentile}_ms": 1000 * latency.get_percentile(percentile)
+                        for percentile in PERCENTILES
+                    },
+                    "max_ms": 1000 * latency.max_seconds,
+                }
+                for method, latency in methods
+            }
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump(self.to_dict(), file, indent=4)
+
+    def format_report(self) -> str:
+        lines = [
+            f"{'calls':>7} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'p99 ms':>9} {'max ms':>9}  method"
+        ]
+
+        for method, stats in self.to_dict().items():
+            lines.append(
+                f"{stats['calls']:>7} {stats['errors']:>6} {stats['p50_ms']:>9.2f} "
+                f"{stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+                f"{stats['max_ms']:>9.2f}  {method}"
+            )
+
+        return "\n".join(lines)
+
+
+def _get_bucket_index(seconds: float) -> int:
+    # Bucket 0 holds everything up to a microsecond
+    return max(0, math.ceil(math.log2(max(seconds, 1e-9) * 1e6) * BUCKETS_PER_DOUBLING))
+
+
+def _get_bucket_bound(index: int) -> float:
+    return 2 ** (index / BUCKETS_PER_DOUBLING) / 1e6
+
+
+active: Union[LatencyStats, None] = None
+
+
+def enable() -> LatencyStats:
+    """
+    Starts recording Backend method latencies, if not already. Returns the
+    stats recorded into.
+    """
+    global active
+
+    if active is None:
+        active = LatencyStats()
+
+    return active
@@ -0,0 +1,259 @@
+"""
+NativePDFWriter for writing fixed-layout PDFs directly.
+
+Pages are written to the file as they are added, and the cross-reference
+table is written from the recorded object offsets when the PDF is saved.
+Only the standard Type 1 fonts are supported, so no fonts are embedded.
+"""
+import zlib
+from array import array
+from functools import lru_cache
+from typing import BinaryIO, Union
+
+from backend.timesheet_layout import PAGE_WIDTH, PAGE_HEIGHT, PDFLine, string_width
+
+
+ENCODING = "cp1252" # Matches /WinAnsiEncoding
+
+# Entries per write when writing the page tree and cross-reference table
+WRITE_CHUNK_SIZE = 1024
+
+# Objects written last, with ids reserved up front
+CATALOG_ID = 1
+PAGES_ID = 2
+RESOURCES_ID = 3
+
+
+def format_number(value: float) -> str:
+    """
+    Formats a coordinate compactly, with up to 3 decimal places.
+    """
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return text if text != "-0" else "0"
+
+
+@lru_cache(maxsize=4096)
+def get_drawn_text(text: str) -> str:
+    """
+    Get the text as it is drawn, with characters outside of WinAnsiEncoding
+    replaced by "?".
+    """
+    return text.encode(ENCODING, "replace").decode(ENCODING)
+
+
+@lru_cache(maxsize=4096)
+def format_string(text: str) -> str:
+    """
+    Formats the text as a PDF literal string. Characters outside of
+    WinAnsiEncoding are replaced.
+    """
+    encoded = text.encode(ENCODING, "replace").decode("latin-1")
+    escaped = encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    return f"({escaped})"
+
+
+class NativePDFWriter:
+    """
+    Writes a PDF page by page from content streams.
+    """
+
+    def __init__(
+        self,
+        file: Union[str, BinaryIO],
+        compress: bool = True,
+        fonts: list[str] = None
+    ):
+        """
+        :param file: The name of the PDF, or a binary file object.
+        :param compress: Optional. Whether to compress page content streams.
+        :param fonts: Optional. Fonts to add to the page resources up front,
+            for content formatted elsewhere, such as by another writer.
+        """
+        self._file = open(file, "wb") if isinstance(file, str) else file
+        self._owns_file = isinstance(file, str)
+        self._compress = compress
+
+        # Compact arrays, so memory per page stays small for long reports
+        self._offsets = array("q", [0] * (RESOURCES_ID + 1)) # Indexed by object id
+        self._position = 0
+        self._next_id = RESOURCES_ID + 1
+
+        self._fonts = {} # Font name to (resource name, object id)
+        self._page_ids = array("q")
+
+        for font in fonts or []:
+            self.get_font_resource(font)
+
+        self._write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._position += len(data)
+
+    def _reserve_id(self) -> int:
+        obj_id = self._next_id
+        self._next_id += 1
+        self._offsets.append(0)
+
+        return obj_id
+
+    def _write_object(self, obj_id: int, body: bytes) -> None:
+        self._offsets[obj_id] = self._position
+        self._write(b"%d 0 obj\n%s\nendobj\n" % (obj_id, body))
+
+    def _write_stream(self, obj_id: int, data: bytes) -> None:
+        if self._compress:
+            data = zlib.compress(data)
+            header = b"<< /Length %d /Filter /FlateDecode >>" % len(data)
+        else:
+            header = b"<< /Length %d >>" % len(data)
+
+        self._write_object(obj_id, header + b"\nstream\n" + data + b"\nendstream")
+
+    def get_font_resource(self, font: str) -> str:
+        """
+        Gets the resource name to select a standard font with in content streams.
+        This is the font name, so formatted content can be reused in any PDF.
+        """
+        if font not in self._fonts:
+            self._fonts[font] = (font, self._reserve_id())
+
+        return self._fonts[font][0]
+
+    def format_lines(self, lines: list[PDFLine]) -> str:
+        """
+        Formats content stream operators that stroke the lines with round caps
+        and joins, as platypus tables do. Lines are stroked as one path per
+        line width.
+        """
+        ops = ["q 1 J 1 j"]
+        lines_by_width = {}
+
+        for line in lines:
+            lines_by_width.setdefault(line.width, []).append(
+                f"{format_number(line.x0)} {format_number(line.y0)} m "
+                f"{format_number(line.x1)} {format_number(line.y1)} l"
+            )
+
+        for width, paths in lines_by_width.items():
+            ops.append(f"{format_number(width)} w")
+            ops.extend(paths)
+            ops.append("S")
+
+        ops.append("Q")
+
+        return "\n".join(ops)
+
+    def format_text(self, items: list[tuple[float, float, str, str, float, bool]]) -> str:
+        """
+        Formats a text object drawing each (x, y, text, font, font size, centred)
+        item, switching fonts only when needed.
+        """
+        ops = ["BT"]
+        font_key = None
+
+        for x, y, text, font, font_size, centred in items:
+            if text == "":
+                continue
+
+            if (font, font_size) != font_key:
+                font_key = (font, font_size)
+                ops.append(f"/{self.get_font_resource(font)} {format_number(font_size)} Tf")
+
+            # Measured as drawn, so replaced characters are centred correctly
+            if centred:
+                x -= string_width(get_drawn_text(text), font, font_size) / 2.0
+
+            ops.append(
+                f"1 0 0 1 {format_number(x)} {format_number(y)} Tm {format_string(text)} Tj"
+            )
+
+        ops.append("ET")
+
+        return "\n".join(ops)
+
+    def add_page(self, content: str) -> None:
+        """
+        Writes a page with the content stream to the file.
+        """
+        content_id = self._reserve_id()
+        page_id = self._reserve_id()
+
+        self._write_stream(content_id, content.encode("latin-1"))
+        self._write_object(
+            page_id,
+            b"<< /Type /Page /Parent %d 0 R /Resources %d 0 R /Contents %d 0 R >>"
+            % (PAGES_ID, RESOURCES_ID, content_id)
+        )
+
+        self._page_ids.append(page_id)
+
+    def get_page_count(self) -> int:
+        return len(self._page_ids)
+
+    def _write_pages(self) -> None:
+        """
+        Writes the page tree, with the kids written in chunks.
+        """
+        self._offsets[PAGES_ID] = self._position
+        self._write(
+            (
+                f"{PAGES_ID} 0 obj\n<< /Type /Pages /Count {len(self._page_ids)} "
+                f"/MediaBox [0 0 {format_number(PAGE_WIDTH)} {format_number(PAGE_HEIGHT)}] "
+                f"/Kids ["
+            ).encode("ascii")
+        )
+
+        for start in range(0, len(self._page_ids), WRITE_CHUNK_SIZE):
+            page_ids = self._page_ids[start:start + WRITE_CHUNK_SIZE]
+            self._write(b"".join(b"%d 0 R " % page_id for page_id in page_ids))
+
+        self._write(b"] >>\nendobj\n")
+
+    def save(self) -> None:
+        """
+        Writes the document catalog, fonts and cross-reference table, then
+        closes the file if the writer opened it.
+        """
+        for font, (_, font_id) in self._fonts.items():
+            self._write_object(
+                font_id,
+                b"<< /Type /Font /Subtype /Type1 /BaseFont /%s "
+                b"/Encoding /WinAnsiEncoding >>" % font.encode("ascii")
+            )
+
+        font_refs = " ".join(
+            f"/{name} {font_id} 0 R" for name, font_id in self._fonts.values()
+        )
+
+        self._write_object(
+            RESOURCES_ID,
+            f"<< /Font << {font_refs} >> /ProcSet [/PDF /Text] >>".encode("ascii")
+        )
+
+        self._write_pages()
+
+        self._write_object(CATALOG_ID, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES_ID)
+
+        xref_position = self._position
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % self._next_id)
+
+        for start in range(1, self._next_id, WRITE_CHUNK_SIZE):
+            offsets = self._offsets[start:min(start + WRITE_CHUNK_SIZE, self._next_id)]
+            self._write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+
+        self._write(
+            b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+            % (self._next_id, CATALOG_ID, xref_position)
+        )
+
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the file if the writer opened it, without finishing the PDF.
+        Called by `save`, and safe to call again.
+        """
+        if self._owns_file:
+            self._file.close()
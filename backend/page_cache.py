@@ -0,0 +1,169 @@
+"""
+PageCache Class for reusing rendered timesheet pages between reports.
+"""
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+from db.db_data import Employee
+
+
+# Bump when the page layout changes, so pages cached before are not reused
+CACHE_VERSION = "1"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def get_employee_key(employee: Employee) -> str:
+    """
+    Hashes everything about an employee that is drawn on their page.
+    """
+    fields = [
+        CACHE_VERSION,
+        employee.employee_id,
+        employee.first_name,
+        employee.last_name,
+        employee.position,
+        employee.contract
+    ]
+
+    for shift in employee.shifts:
+        fields.extend([
+            shift.date.isoformat(),
+            shift.time_in.isoformat() if shift.time_in else "",
+            shift.time_out.isoformat() if shift.time_out else "",
+            str(shift.hours_reg),
+            str(shift.hours_ot)
+        ])
+
+    # Unit separator, so fields can't run into each other
+    return hashlib.sha256("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    SQLite-backed cache of rendered page content, keyed by the hash of each
+    employee's page inputs. When the cache grows past its size cap, the least
+    recently used pages are evicted.
+    """
+
+    def __init__(self, db: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        :param db: The path of the cache database, or ":memory:".
+        :param max_bytes: Optional. The most compressed page content to keep.
+        """
+        self.db = db
+        self.conn = sqlite3.connect(db)
+        self.cur = self.conn.cursor()
+        self.max_bytes = max_bytes
+        self._thread_id = threading.get_ident()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._used_keys = [] # Hits not yet marked as used in the database
+
+        self.cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page (
+                key TEXT PRIMARY KEY,
+                content BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            """
+        )
+        self.cur.execute("CREATE INDEX IF NOT EXISTS page_last_used ON page (last_used);")
+        self.conn.commit()
+
+    @contextmanager
+    def open_for_thread(self) -> Iterator["PageCache"]:
+        """
+        Get a cache usable on the calling thread, like
+        DatabaseHandler.open_for_thread. That's this cache on the thread that
+        created it, otherwise a new connection to the same cache, flushed and
+        closed on exit. A RAM cache can't be opened again.
+        """
+        if threading.get_ident() == self._thread_id:
+            yield self
+            return
+
+        page_cache = PageCache(self.db, self.max_bytes)
+
+        try:
+            yield page_cache
+        finally:
+            page_cache.close()
+
+    def get(self, key: str) -> Union[str, None]:
+        """
+        Get the cached page content for the key. If none, returns None.
+        """
+        row = self.cur.execute("SELECT content FROM page WHERE key=?", (key,)).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._used_keys.append(key)
+
+        return zlib.decompress(row[0]).decode("latin-1")
+
+    def put(self, key: str, content: str) -> None:
+        """
+        Caches page content for the key, replacing any content already cached.
+        """
+        data = zlib.compress(content.encode("latin-1"))
+
+        self.cur.execute(
+            "INSERT OR REPLACE INTO page (key, content, size, last_used) VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time())
+        )
+
+    def get_size(self) -> int:
+        """
+        Get the total size of the cached page content in bytes.
+        """
+        return self.cur.execute("SELECT COALESCE(SUM(size), 0) FROM page").fetchone()[0]
+
+    def flush(self) -> None:
+        """
+        Marks the pages used since the last flush, evicts the least recently
+        used pages until the cache is within its size cap, and commits.
+        """
+        now = time.time()
+        self.cur.executemany(
+            "UPDATE page SET last_used=? WHERE key=?",
+            ((now, key) for key in self._used_keys)
+        )
+        self._used_keys = []
+
+        excess = self.get_size() - self.max_bytes
+
+        if excess > 0:
+            res = self.cur.execute("SELECT key, size FROM page ORDER BY last_used")
+            evicted = []
+
+            for key, size in res.fetchall():
+                if excess <= 0:
+                    break
+
+                evicted.append((key,))
+                excess -= size
+
+            self.cur.executemany("DELETE FROM page WHERE key=?", evicted)
+
+        self.conn.commit()
+
+    def clear(self) -> None:
+        self.cur.execute("DELETE FROM page")
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.flush()
+        self.conn.close()
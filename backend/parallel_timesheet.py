@@ -0,0 +1,109 @@
+"""
+Renders a PDFTimesheet report in parallel, one shard of employees per process.
+"""
+import io
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable
+
+from db.db_data import Employee
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+
+
+# Shards per worker. More shards give smoother progress but more merging
+SHARDS_PER_WORKER = 4
+
+
+def _render_shard(
+    employees: list[Employee],
+    page_offset: int,
+    render_mode: RenderMode
+) -> bytes:
+    """
+    Renders the pages for a shard of employees. Runs in a worker process.
+    """
+    buffer = io.BytesIO()
+
+    timesheet = PDFTimesheet(
+        employees, filename=buffer, page_offset=page_offset, render_mode=render_mode
+    )
+    timesheet.get_pdf().save()
+
+    return buffer.getvalue()
+
+
+def _split_shards(employees: list[Employee], shard_size: int) -> list[list[Employee]]:
+    return [
+        employees[start_idx:start_idx + shard_size]
+        for start_idx in range(0, len(employees), shard_size)
+    ]
+
+
+def save_timesheet(
+    employees: list[Employee],
+    filename: str,
+    workers: int,
+    shard_size: int = None,
+    progress_callback: Callable[[int, int], None] = None,
+    render_mode: RenderMode = RenderMode.TABLE
+) -> None:
+    """
+    Saves the same report as PDFTimesheet, rendering shards of employees in
+    separate processes and merging them in the original order. Each shard
+    numbers its pages from its position in the report.
+
+    :param employees: The employees to include in the PDF.
+    :param filename: The name of the PDF.
+    :param workers: The number of worker processes.
+    :param shard_size: Optional. The number of employees per shard.
+    :param progress_callback: Optional. Called with the number of employees
+        rendered so far and the total, as shards finish. If it raises, pending
+        shards are cancelled and the exception is propagated.
+    :param render_mode: Optional. How each shard's pages are drawn.
+    :raises ValueError: If any employee has fewer than constants.PAY_PERIOD shifts.
+    """
+    # Imported here so the serial renderer doesn't depend on pypdf
+    from pypdf import PdfReader, PdfWriter
+
+    if shard_size is None:
+        shard_size = max(1, math.ceil(len(employees) / (workers * SHARDS_PER_WORKER)))
+
+    shards = _split_shards(employees, shard_size)
+    shard_pdfs = [None] * len(shards)
+
+    if len(shards) == 0:
+        PDFTimesheet([], filename=filename).get_pdf().save()
+        return
+
+    # Spawn rather than fork, the caller may be running other threads
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+    try:
+        futures = {
+            executor.submit(_render_shard, shard, i * shard_size, render_mode): i
+            for i, shard in enumerate(shards)
+        }
+
+        rendered = 0
+
+        for future in as_completed(futures):
+            i = futures[future]
+            shard_pdfs[i] = future.result()
+
+            rendered += len(shards[i])
+
+            if progress_callback is not None:
+                progress_callback(rendered, len(employees))
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    writer = PdfWriter()
+
+    for shard_pdf in shard_pdfs:
+        writer.append(PdfReader(io.BytesIO(shard_pdf)))
+
+    with open(filename, "wb") as file:
+        writer.write(file)
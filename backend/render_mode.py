@@ -0,0 +1,23 @@
+"""
+RenderMode Enum, kept apart from PDFTimesheet so it can be used without
+importing reportlab.
+"""
+from enum import Enum, auto
+
+
+class RenderMode(Enum):
+    """
+    How PDFTimesheet draws each page.
+
+    - TABLE: Lays out and draws every page with platypus tables.
+    - TEMPLATE: Draws the static parts of a page once as a reusable form,
+      then only draws the text that changes on each page.
+    - CANVAS: Computes the table geometry once per layout, then draws each
+      page's lines and text with raw canvas calls.
+    - NATIVE: Like CANVAS, but writes the PDF directly with NativePDFWriter
+      instead of reportlab, reusing each layout's formatted static content.
+    """
+    TABLE = auto()
+    TEMPLATE = auto()
+    CANVAS = auto()
+    NATIVE = auto()
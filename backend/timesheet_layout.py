@@ -0,0 +1,301 @@
+"""
+Page layout for drawing timesheet pages with raw drawing operations.
+
+Computes the geometry platypus would use for a table, so that pages with the
+same layout can be drawn repeatedly without laying out tables again.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from reportlab import platypus
+from reportlab.lib import pagesizes, units
+from reportlab.pdfbase import pdfmetrics
+
+
+PAGE_WIDTH, PAGE_HEIGHT = pagesizes.A4
+PAGE_TOP = PAGE_HEIGHT - units.inch
+FONT = "Helvetica"
+
+LABEL_X = units.inch
+LABELLED_TEXT_X = units.inch + (units.inch * 1.95)
+TIMESHEET_X = units.inch * 1.5
+
+
+@dataclass
+class PDFLine:
+    """
+    A straight line from (x0, y0) to (x1, y1).
+    """
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    width: float
+
+
+@dataclass
+class PDFText:
+    """
+    Static text, drawn the same on every page with the layout.
+    """
+    x: float
+    y: float
+    text: str
+    font: str
+    font_size: int
+    centred: bool = False
+
+
+@dataclass
+class PDFTextSlot:
+    """
+    Where a piece of variable text is drawn on a page.
+    """
+    x: float
+    y: float
+    font: str
+    font_size: int
+    centred: bool = False
+
+
+@dataclass
+class PDFPageLayout:
+    """
+    Everything drawn on a page with this layout. The slots are in the order
+    their values are drawn.
+    """
+    lines: list[PDFLine] = field(default_factory=list)
+    texts: list[PDFText] = field(default_factory=list)
+    slots: list[PDFTextSlot] = field(default_factory=list)
+
+
+@lru_cache(maxsize=4096)
+def string_width(text: str, font: str, font_size: float) -> float:
+    """
+    Gets the width of the text. Memoized, since most text is the same on every page.
+    """
+    return pdfmetrics.stringWidth(text, font, font_size)
+
+
+def _get_cell(table: platypus.Table, row: int, col: int) -> str:
+    values = table._cellvalues[row]
+    return str(values[col]) if col < len(values) else ""
+
+
+def _get_spans(table: platypus.Table) -> list[tuple[int, int, int, int]]:
+    """
+    Gets each span as (start col, start row, end col, end row).
+    """
+    spans = []
+
+    for _, (sc, sr), (ec, er) in table._spanCmds:
+        sc, ec, sr, er = table.normCellRange(sc, ec, sr, er)
+        spans.append((sc, sr, ec, er))
+
+    return spans
+
+
+def _is_spanned(spans: list, row: int, col: int) -> bool:
+    """
+    Checks if a cell is covered by a span it doesn't start.
+    """
+    return any(
+        sc <= col <= ec and sr <= row <= er and (col, row) != (sc, sr)
+        for sc, sr, ec, er in spans
+    )
+
+
+def _calc_col_widths(table: platypus.Table, spans: list) -> list[float]:
+    widths = [0.0] * table._ncols
+
+    for row in range(table._nrows):
+        for col in range(table._ncols):
+            # Cells spanning columns don't set the width of any one column
+            if any(sc <= col <= ec and sr <= row <= er and sc != ec for sc, sr, ec, er in spans):
+                continue
+
+            style = table._cellStyles[row][col]
+            width = string_width(
+                _get_cell(table, row, col), style.fontname, style.fontsize
+            ) + style.leftPadding + style.rightPadding
+
+            widths[col] = max(widths[col], width)
+
+    return widths
+
+
+def _calc_row_heights(table: platypus.Table) -> list[float]:
+    heights = []
+
+    for row in range(table._nrows):
+        heights.append(max(
+            (style.leading or 1.2 * style.fontsize) + style.topPadding + style.bottomPadding
+            for style in table._cellStyles[row]
+        ))
+
+    return heights
+
+
+def _add_hline(lines: list, col_pos: list, row_pos: list, sc: int, ec: int,
+               row: int, width: float, spans: list) -> None:
+    """
+    Adds the horizontal line above `row` from column `sc` to `ec`, skipping
+    parts inside a span.
+    """
+    start = sc
+
+    for col in range(sc, ec + 1):
+        blocked = any(sc_ <= col <= ec_ and sr_ < row <= er_ for sc_, sr_, ec_, er_ in spans)
+
+        if blocked:
+            if start < col:
+                lines.append(PDFLine(col_pos[start], row_pos[row], col_pos[col], row_pos[row], width))
+            start = col + 1
+
+    if start <= ec:
+        lines.append(PDFLine(col_pos[start], row_pos[row], col_pos[ec + 1], row_pos[row], width))
+
+
+def _add_vline(lines: list, col_pos: list, row_pos: list, sr: int, er: int,
+               col: int, width: float, spans: list) -> None:
+    """
+    Adds the vertical line left of `col` from row `sr` to `er`, skipping
+    parts inside a span.
+    """
+    start = sr
+
+    for row in range(sr, er + 1):
+        blocked = any(sr_ <= row <= er_ and sc_ < col <= ec_ for sc_, sr_, ec_, er_ in spans)
+
+        if blocked:
+            if start < row:
+                lines.append(PDFLine(col_pos[col], row_pos[start], col_pos[col], row_pos[row], width))
+            start = row + 1
+
+    if start <= er:
+        lines.append(PDFLine(col_pos[col], row_pos[start], col_pos[col], row_pos[er + 1], width))
+
+
+def _add_table_lines(
+    lines: list[PDFLine],
+    table: platypus.Table,
+    col_pos: list[float],
+    row_pos: list[float],
+    spans: list
+) -> None:
+    for cmd in table._linecmds:
+        op, (sc, sr), (ec, er), width = cmd[:4]
+        sc, ec, sr, er = table.normCellRange(sc, ec, sr, er)
+
+        hline_rows, vline_cols = [], []
+
+        if op in ("GRID", "BOX", "OUTLINE"):
+            hline_rows += [sr, er + 1]
+            vline_cols += [sc, ec + 1]
+        if op in ("GRID", "INNERGRID"):
+            hline_rows += list(range(sr + 1, er + 1))
+            vline_cols += list(range(sc + 1, ec + 1))
+        if op == "LINEABOVE":
+            hline_rows += [sr]
+        if op == "LINEBELOW":
+            hline_rows += [er + 1]
+        if op == "LINEBEFORE":
+            vline_cols += [sc]
+        if op == "LINEAFTER":
+            vline_cols += [ec + 1]
+
+        if not hline_rows and not vline_cols:
+            raise ValueError(f"unsupported line command: {op}")
+
+        for row in hline_rows:
+            _add_hline(lines, col_pos, row_pos, sc, ec, row, width, spans)
+
+        for col in vline_cols:
+            _add_vline(lines, col_pos, row_pos, sr, er, col, width, spans)
+
+
+def get_table_size(table: platypus.Table) -> tuple[float, float]:
+    """
+    Gets the width and height platypus would lay the table out with.
+    """
+    return (
+        sum(_calc_col_widths(table, _get_spans(table))),
+        sum(_calc_row_heights(table))
+    )
+
+
+def add_table(
+    layout: PDFPageLayout,
+    table: platypus.Table,
+    x: float,
+    top_y: float,
+    variable_cells: list[tuple[int, int]] = None
+) -> tuple[float, float]:
+    """
+    Adds a styled table to the layout, with its top left corner at (x, top_y).
+    Cells in `variable_cells`, as (row, col), get a slot instead of static text.
+    Only CENTER aligned, MIDDLE aligned, single-line text cells are supported.
+
+    :return: The width and height of the table.
+    """
+    variable_cells = variable_cells or []
+    spans = _get_spans(table)
+
+    col_widths = _calc_col_widths(table, spans)
+    row_heights = _calc_row_heights(table)
+
+    col_pos = [x]
+    for width in col_widths:
+        col_pos.append(col_pos[-1] + width)
+
+    row_pos = [top_y]
+    for height in row_heights:
+        row_pos.append(row_pos[-1] - height)
+
+    variable = set(variable_cells)
+    cell_items = {}
+
+    for row in range(table._nrows):
+        for col in range(table._ncols):
+            if _is_spanned(spans, row, col):
+                continue
+
+            text = _get_cell(table, row, col)
+
+            if (row, col) not in variable and text == "":
+                continue
+
+            style = table._cellStyles[row][col]
+
+            if style.alignment not in ("CENTER", "CENTRE") or style.valign != "MIDDLE":
+                raise ValueError("only centred cells are supported")
+
+            ec, er = col, row
+
+            for sc_, sr_, ec_, er_ in spans:
+                if (sc_, sr_) == (col, row):
+                    ec, er = ec_, er_
+
+            cell_width = col_pos[ec + 1] - col_pos[col]
+            cell_height = row_pos[row] - row_pos[er + 1]
+
+            # Same text position as platypus
+            text_x = col_pos[col] + (cell_width + style.leftPadding - style.rightPadding) / 2.0
+            text_y = row_pos[er + 1] + (
+                style.bottomPadding + cell_height - style.topPadding + style.leading
+            ) / 2.0 - style.fontsize
+
+            if (row, col) in variable:
+                cell_items[row, col] = PDFTextSlot(
+                    text_x, text_y, style.fontname, style.fontsize, centred=True
+                )
+            else:
+                layout.texts.append(PDFText(
+                    text_x, text_y, text, style.fontname, style.fontsize, centred=True
+                ))
+
+    layout.slots.extend(cell_items[cell] for cell in variable_cells)
+
+    _add_table_lines(layout.lines, table, col_pos, row_pos, spans)
+
+    return col_pos[-1] - col_pos[0], row_pos[0] - row_pos[-1]
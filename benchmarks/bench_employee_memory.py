@@ -0,0 +1,69 @@
+"""
+Benchmark of the memory each loaded employee takes, including their shifts.
+
+Measures the employees returned by DatabaseHandler.get_employees and
+Backend.generate_employees_from_csv. Run from the repository root:
+
+    python -m benchmarks.bench_employee_memory --employees 5000
+"""
+import gc
+import os
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable
+
+from backend.backend import Backend
+from benchmarks import synthetic_data
+from db.db_handler import DatabaseHandler
+
+
+def bench_memory(load: Callable[[], object]) -> int:
+    """
+    Returns the bytes still allocated once `load` returns, while its result
+    is held. Loads once first, so caches and imports aren't counted.
+    """
+    load()
+    gc.collect()
+
+    tracemalloc.start()
+    result = load()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_handler = DatabaseHandler(os.path.join(tmp_dir, "bench.db"))
+        synthetic_data.fill_db(db_handler, args.employees)
+
+        csv_path = os.path.join(tmp_dir, "employees.csv")
+        synthetic_data.write_employees_csv(csv_path, args.employees)
+
+        backend = Backend(db_handler)
+
+        loads = [
+            ("get_employees", db_handler.get_employees),
+            ("generate_employees_from_csv", lambda: backend.generate_employees_from_csv(csv_path)),
+        ]
+
+        print(f"{'load':<30} {'MB':>8} {'bytes/employee':>15}")
+
+        for name, load in loads:
+            size = bench_memory(load)
+            print(f"{name:<30} {size / (1024 * 1024):>8.1f} {size / args.employees:>15.0f}")
+
+        backend.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark comparing the PDFTimesheet render modes.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_render_modes --employees 1000
+"""
+import io
+import time
+import argparse
+import datetime
+
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+from db.db_data import Employee, Shift
+import constants
+
+
+def make_employees(count: int) -> list[Employee]:
+    start_date = datetime.date(year=2024, month=7, day=1)
+
+    return [
+        Employee(
+            employee_id=str(i),
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            position="Ornithologist",
+            contract="Full-time",
+            shifts=[
+                Shift(date=start_date + datetime.timedelta(days=day))
+                for day in range(constants.PAY_PERIOD_DAYS)
+            ]
+        )
+        for i in range(count)
+    ]
+
+
+def bench_render_mode(employees: list[Employee], render_mode: RenderMode) -> tuple[float, int]:
+    """
+    Renders the report in memory. Returns the seconds taken and the PDF size.
+    """
+    buffer = io.BytesIO()
+
+    start = time.perf_counter()
+    PDFTimesheet(employees, filename=buffer, render_mode=render_mode).get_pdf().save()
+    elapsed = time.perf_counter() - start
+
+    return elapsed, len(buffer.getvalue())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--employees", type=int, default=1000)
+    args = parser.parse_args()
+
+    employees = make_employees(args.employees)
+    baseline = None
+
+    print(f"{'mode':<10} {'seconds':>8} {'ms/page':>8} {'size (KB)':>10} {'speedup':>8}")
+
+    for render_mode in RenderMode:
+        elapsed, size = bench_render_mode(employees, render_mode)
+        baseline = baseline or elapsed
+
+        print(
+            f"{render_mode.name:<10} {elapsed:>8.2f} "
+            f"{1000 * elapsed / len(employees):>8.2f} "
+            f"{size / 1024:>10.0f} {baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
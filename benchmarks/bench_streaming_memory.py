@@ -0,0 +1,76 @@
+"""
+Benchmark of peak memory when saving reports of increasing size.
+
+Compares a materialized list of employees drawn with platypus tables against
+an iterator of employees streamed to disk in NATIVE mode. Run from the
+repository root:
+
+    python -m benchmarks.bench_streaming_memory --counts 100 400 1600
+"""
+import os
+import time
+import argparse
+import tempfile
+import tracemalloc
+from typing import Callable, Iterable, Iterator
+
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+from benchmarks.bench_render_modes import make_employees
+from db.db_data import Employee
+
+
+def iter_employees(count: int, batch_size: int = 100) -> Iterator[Employee]:
+    """
+    Creates employees a batch at a time, like DatabaseHandler.iter_employees.
+    """
+    for start in range(0, count, batch_size):
+        for employee in make_employees(min(batch_size, count - start)):
+            yield employee
+
+
+def bench_memory(
+    get_employees: Callable[[], Iterable[Employee]],
+    render_mode: RenderMode,
+    file_path: str
+) -> tuple[float, float]:
+    """
+    Saves the report to the file. Returns the seconds taken and the peak
+    traced memory in MB, including creating the employees.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    PDFTimesheet(get_employees(), filename=file_path, render_mode=render_mode).get_pdf().save()
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", type=int, nargs="+", default=[100, 400, 1600])
+    args = parser.parse_args()
+
+    print(f"{'path':<16} {'employees':>9} {'seconds':>8} {'peak (MB)':>10} {'size (MB)':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "report.pdf")
+
+        for count in args.counts:
+            paths = [
+                ("list, TABLE", lambda: make_employees(count), RenderMode.TABLE),
+                ("stream, NATIVE", lambda: iter_employees(count), RenderMode.NATIVE)
+            ]
+
+            for name, get_employees, render_mode in paths:
+                elapsed, peak = bench_memory(get_employees, render_mode, file_path)
+                size = os.path.getsize(file_path) / (1024 * 1024)
+
+                print(f"{name:<16} {count:>9} {elapsed:>8.2f} {peak:>10.1f} {size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
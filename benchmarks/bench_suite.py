@@ -0,0 +1,227 @@
+"""
+Benchmark suite for the database, import and report hot paths.
+
+Times each case at each employee count, saves the results as JSON and, given
+a baseline saved by an earlier run, flags the cases that got slower. Run from
+the repository root:
+
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --output current.json --baseline baseline.json
+
+Exits with status 1 if any case regressed. Reports of 100k employees take
+minutes in TABLE mode, use --sizes or --cases to run a subset.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import datetime
+from typing import Callable
+
+from backend.backend import Backend
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+from benchmarks.synthetic_data import make_employees, write_employees_csv
+from db.db_handler import DatabaseHandler
+
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.2 # Fraction slower than the baseline that is flagged
+MIN_REGRESSION_SECONDS = 0.02 # Smaller slowdowns are timing noise
+
+LONG_RUN_SECONDS = 10 # Runs this slow aren't repeated
+
+
+def make_backend(db_path: str) -> Backend:
+    """
+    Creates a backend on a new database, with the default pay period.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    return Backend(DatabaseHandler(db_path))
+
+
+# Each case sets up in the directory for the employee count, and returns the
+# function that is timed and the cleanup to run after
+Case = Callable[[str, int, argparse.Namespace], tuple[Callable[[], None], Callable[[], None]]]
+
+
+def setup_get_employees(tmp_dir: str, count: int, _) -> tuple:
+    backend = make_backend(os.path.join(tmp_dir, "bench.db"))
+    backend.add_employees(make_employees(count))
+
+    return backend.get_employees, backend.shutdown
+
+
+def setup_add_employees(tmp_dir: str, count: int, _) -> tuple:
+    backend = make_backend(os.path.join(tmp_dir, "bench.db"))
+    employees = make_employees(count)
+
+    return lambda: backend.add_employees(employees), backend.shutdown
+
+
+def setup_update_employees(tmp_dir: str, count: int, _) -> tuple:
+    backend = make_backend(os.path.join(tmp_dir, "bench.db"))
+    employees = make_employees(count)
+    backend.add_employees(employees)
+
+    for employee in employees:
+        employee.position = "Zoologist"
+        employee.shifts[0].hours_ot = 150
+
+    return lambda: backend.update_employees(employees), backend.shutdown
+
+
+def setup_generate_employees_from_csv(tmp_dir: str, count: int, _) -> tuple:
+    import pandas # Imported lazily by the backend, so the import isn't timed
+
+    backend = make_backend(os.path.join(tmp_dir, "bench.db"))
+    csv_path = os.path.join(tmp_dir, "employees.csv")
+    write_employees_csv(csv_path, count)
+
+    return lambda: backend.generate_employees_from_csv(csv_path), backend.shutdown
+
+
+def setup_pdf_timesheet(_, count: int, args: argparse.Namespace) -> tuple:
+    employees = make_employees(count)
+    render_mode = RenderMode[args.render_mode.upper()]
+
+    def run() -> None:
+        PDFTimesheet(employees, filename=io.BytesIO(), render_mode=render_mode).get_pdf().save()
+
+    return run, lambda: None
+
+
+CASES: dict[str, Case] = {
+    "get_employees": setup_get_employees,
+    "add_employees": setup_add_employees,
+    "update_employees": setup_update_employees,
+    "generate_employees_from_csv": setup_generate_employees_from_csv,
+    "pdf_timesheet": setup_pdf_timesheet,
+}
+
+
+def time_case(case: Case, count: int, args: argparse.Namespace) -> float:
+    """
+    Returns the best time in seconds of `args.repeat` runs, each set up afresh.
+    """
+    best = None
+
+    for _ in range(args.repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run, cleanup = case(tmp_dir, count, args)
+
+            try:
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+            finally:
+                cleanup()
+
+        best = elapsed if best is None else min(best, elapsed)
+
+        if elapsed > LONG_RUN_SECONDS:
+            break
+
+    return best
+
+
+def get_result_name(case_name: str, count: int) -> str:
+    return f"{case_name}[{count}]"
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    threshold: float
+) -> list[str]:
+    """
+    Prints each result against the baseline. Returns the names of the results
+    more than `threshold` slower than the baseline, ignoring slowdowns too
+    small to tell from noise.
+    """
+    regressions = []
+
+    print(f"\n{'case':<36} {'baseline':>9} {'current':>9} {'change':>8}")
+
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:<36} {'-':>9} {seconds:>9.3f} {'new':>8}")
+            continue
+
+        change = seconds / baseline[name] - 1
+        flag = ""
+
+        if change > threshold and seconds - baseline[name] > MIN_REGRESSION_SECONDS:
+            regressions.append(name)
+            flag = " REGRESSION"
+
+        print(f"{name:<36} {baseline[name]:>9.3f} {seconds:>9.3f} {change:>+8.0%}{flag}")
+
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Runs per case, the best is kept")
+    parser.add_argument(
+        "--render-mode",
+        choices=[render_mode.name.lower() for render_mode in RenderMode],
+        default=RenderMode.TABLE.name.lower()
+    )
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against results saved by an earlier run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Fraction slower than the baseline to flag as a regression")
+
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    results = {}
+
+    print(f"{'case':<36} {'seconds':>9} {'us/employee':>12}")
+
+    for case_name in args.cases:
+        for count in args.sizes:
+            name = get_result_name(case_name, count)
+            results[name] = time_case(CASES[case_name], count, args)
+
+            print(f"{name:<36} {results[name]:>9.3f} {1e6 * results[name] / count:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump({
+                "created": datetime.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "render_mode": args.render_mode,
+                "results": results,
+            }, file, indent=4)
+
+    if not args.baseline:
+        return 0
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+Seeded generator of synthetic employees and shifts for benchmarks and stress
+tests. The same seed always generates the same data.
+
+Employees are written as CSVs in the layout generate_employees_from_csv reads,
+shifts as CSVs in the shift export layout, or both are bulk loaded straight
+into a database. Run from the repository root:
+
+    python -m benchmarks.synthetic_data 100000 --db roster.db
+    python -m benchmarks.synthetic_data 100000 --csv employees.csv --shifts-csv shifts.csv
+"""
+import csv
+import random
+import argparse
+import datetime
+import itertools
+from typing import Iterator
+
+from backend import exporters
+from db.db_data import PayPeriod, Employee, Shift
+from db.db_handler import DatabaseHandler
+import constants
+import utils
+
+
+DEFAULT_SEED = 0
+DEFAULT_START_DATE = datetime.date(year=2024, month=7, day=1)
+DB_BATCH_SIZE = 10000 # Employees bulk added per transaction
+
+EMPLOYEE_CSV_COLUMNS = ["Employee No", "First Name", "Last Name", "Job Title", "Contract"]
+
+FIRST_NAMES = [
+    "Aaron", "Alissa", "Amara", "Ben", "Carmen", "Chen", "Dmitri", "Elena", "Farah",
+    "Gabriel", "Hana", "Ibrahim", "Isla", "Jamal", "Julia", "Kenji", "Lena", "Lucas",
+    "Maya", "Mateo", "Nadia", "Noah", "Olga", "Omar", "Priya", "Quinn", "Rosa",
+    "Samuel", "Sofia", "Tariq", "Uma", "Victor", "Wen", "Xavier", "Yara", "Zoe",
+]
+
+LAST_NAMES = [
+    "Abbott", "Alvarez", "Bauer", "Chen", "Costa", "Dubois", "Evans", "Fischer",
+    "García", "Haddad", "Ivanova", "Jensen", "Kim", "Kowalski", "Li", "Martin",
+    "Moss", "Nakamura", "Nguyen", "O'Brien", "Patel", "Rivers", "Rossi", "Santos",
+    "Schmidt", "Singh", "Tanaka", "Walker", "Wang", "Yilmaz",
+]
+
+POSITIONS = [
+    "Ornithologist", "Zoologist", "Veterinarian", "Keeper", "Senior Keeper",
+    "Educator", "Curator", "Groundskeeper", "Ticketing", "Maintenance",
+]
+
+CONTRACTS = ["Full-time", "Full-time", "Full-time", "Part-time", "Part-time", "Casual"]
+
+START_TIMES = [datetime.time(hour=h, minute=m) for h in range(6, 11) for m in (0, 30)]
+
+# Shift lengths in hours, with their weights
+WEEKDAY_LENGTHS = {4: 4, 6: 6, 7.5: 10, 8: 50, 8.5: 10, 9: 8, 10: 6, 12: 2}
+WEEKEND_LENGTHS = {4: 3, 8: 5, 10: 2}
+
+WEEKDAY_OFF_WEIGHT = 4 # Absences and days off
+WEEKEND_OFF_WEIGHT = 90
+
+
+def _to_hundredths(hours: float) -> int:
+    return round(hours * 100)
+
+
+def _get_shift_values(lengths: dict[float, int], off_weight: int) -> tuple[list, list]:
+    """
+    Gets every (time_in, time_out, hours_reg, hours_ot) a shift can have,
+    formatted as stored, and their cumulative weights.
+    """
+    values = [(None, None, 0, 0)]
+    weights = [off_weight]
+
+    for length, weight in lengths.items():
+        for start_time in START_TIMES:
+            start = datetime.datetime.combine(DEFAULT_START_DATE, start_time)
+            end = start + datetime.timedelta(hours=length)
+
+            values.append((
+                start.strftime(constants.TIME_FORMAT),
+                end.strftime(constants.TIME_FORMAT),
+                _to_hundredths(min(length, 8)),
+                _to_hundredths(max(length - 8, 0))
+            ))
+            weights.append(weight / len(START_TIMES))
+
+    return values, list(itertools.accumulate(weights))
+
+
+WEEKDAY_SHIFTS = _get_shift_values(WEEKDAY_LENGTHS, WEEKDAY_OFF_WEIGHT)
+WEEKEND_SHIFTS = _get_shift_values(WEEKEND_LENGTHS, WEEKEND_OFF_WEIGHT)
+
+
+def iter_rows(
+    count: int,
+    seed: int = DEFAULT_SEED,
+    start_date: datetime.date = DEFAULT_START_DATE
+) -> Iterator[tuple[tuple, list[tuple]]]:
+    """
+    Generates the employees, yielding each as its employee row and shift rows,
+    formatted as DatabaseHandler.add_employee_rows takes them. Each employee
+    has a shift for every day of the pay period starting on `start_date`.
+    """
+    rng = random.Random(seed)
+    id_width = len(str(count))
+
+    dates = [
+        utils.next_date(start_date, i) for i in range(constants.PAY_PERIOD_DAYS)
+    ]
+    weekdays = [date.strftime(constants.DATE_FORMAT) for date in dates if date.weekday() < 5]
+    weekends = [date.strftime(constants.DATE_FORMAT) for date in dates if date.weekday() >= 5]
+    date_order = sorted(weekdays + weekends)
+
+    for i in range(count):
+        employee_id = f"E{i + 1:0{id_width}d}"
+
+        employee_row = (
+            employee_id,
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            rng.choice(POSITIONS),
+            rng.choice(CONTRACTS)
+        )
+
+        # One draw per kind of day is much faster than one draw per day
+        shifts = dict(zip(weekdays, rng.choices(
+            WEEKDAY_SHIFTS[0], cum_weights=WEEKDAY_SHIFTS[1], k=len(weekdays)
+        )))
+        shifts.update(zip(weekends, rng.choices(
+            WEEKEND_SHIFTS[0], cum_weights=WEEKEND_SHIFTS[1], k=len(weekends)
+        )))
+
+        shift_rows = [(date, *shifts[date], employee_id) for date in date_order]
+
+        yield employee_row, shift_rows
+
+
+def make_employees(
+    count: int,
+    seed: int = DEFAULT_SEED,
+    start_date: datetime.date = DEFAULT_START_DATE
+) -> list[Employee]:
+    """
+    Generates the employees as Employee objects.
+    """
+    return [
+        Employee(
+            *employee_row,
+            shifts=[
+                Shift(
+                    date=utils.decode_date(date),
+                    time_in=utils.decode_time(time_in),
+                    time_out=utils.decode_time(time_out),
+                    hours_reg=hours_reg,
+                    hours_ot=hours_ot
+                )
+                for date, time_in, time_out, hours_reg, hours_ot, _ in shift_rows
+            ]
+        )
+        for employee_row, shift_rows in iter_rows(count, seed, start_date)
+    ]
+
+
+def write_employees_csv(file_path: str, count: int, seed: int = DEFAULT_SEED) -> None:
+    """
+    Writes the employees in the layout generate_employees_from_csv reads.
+    """
+    with open(file_path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(EMPLOYEE_CSV_COLUMNS)
+        writer.writerows(employee_row for employee_row, _ in iter_rows(count, seed))
+
+
+def write_shifts_csv(
+    file_path: str,
+    count: int,
+    seed: int = DEFAULT_SEED,
+    start_date: datetime.date = DEFAULT_START_DATE
+) -> None:
+    """
+    Writes the employees' shifts, one row per shift, in the shift export layout.
+    """
+    rows = (
+        (*employee_row, *shift_row[:-1])
+        for employee_row, shift_rows in iter_rows(count, seed, start_date)
+        for shift_row in shift_rows
+    )
+
+    exporters.export_rows(rows, file_path, exporters.ExportFormat.CSV)
+
+
+def fill_db(
+    db_handler: DatabaseHandler,
+    count: int,
+    seed: int = DEFAULT_SEED,
+    start_date: datetime.date = DEFAULT_START_DATE
+) -> None:
+    """
+    Bulk adds the employees and their shifts to the database, creating its
+    tables if needed, and sets the pay period to match the shifts.
+    """
+    db_handler.create_settings_table()
+    db_handler.create_employee_table()
+    db_handler.create_shift_table()
+
+    db_handler.update_pay_period(PayPeriod(
+        start_date=start_date,
+        end_date=utils.next_date(start_date, constants.PAY_PERIOD_DAYS - 1)
+    ))
+
+    rows = iter_rows(count, seed, start_date)
+
+    while batch := list(itertools.islice(rows, DB_BATCH_SIZE)):
+        db_handler.add_employee_rows(
+            (employee_row for employee_row, _ in batch),
+            (shift_row for _, shift_rows in batch for shift_row in shift_rows)
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("employees", type=int, help="The number of employees to generate")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=DEFAULT_START_DATE,
+        help="The first day of the pay period, as YYYY-MM-DD"
+    )
+    parser.add_argument("--db", help="Bulk load into this database")
+    parser.add_argument("--csv", help="Write the employees to this CSV, for importing")
+    parser.add_argument("--shifts-csv", help="Write the shifts to this CSV")
+    args = parser.parse_args()
+
+    if not (args.db or args.csv or args.shifts_csv):
+        parser.error("nothing to write, give at least one of --db, --csv or --shifts-csv")
+
+    if args.db:
+        db_handler = DatabaseHandler(args.db)
+
+        try:
+            fill_db(db_handler, args.employees, args.seed, args.start_date)
+        finally:
+            db_handler.close()
+
+    if args.csv:
+        write_employees_csv(args.csv, args.employees, args.seed)
+
+    if args.shifts_csv:
+        write_shifts_csv(args.shifts_csv, args.employees, args.seed, args.start_date)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Headless entry point for generating timesheet reports without the GUI.
+
+Examples:
+
+    python cli.py timesheet.pdf
+    python cli.py timesheet.pdf --position ornith --render-mode native
+    python cli.py timesheets.zip --per-employee --zip --workers 4
+    python cli.py shifts.xlsx --export --contract full
+    python cli.py totals.csv --totals
+"""
+import os
+import sys
+import logging
+import argparse
+from typing import Iterable, Iterator
+
+import constants
+from db.db_data import Employee
+from db.db_handler import DatabaseHandler
+from db.query_stats import QueryStats
+from backend.backend import Backend
+from backend.render_mode import RenderMode
+from backend.page_cache import PageCache
+from backend import latency_stats
+from gui.employee_filter import FilterIndex, matches_queries, normalize_query
+
+
+_logger = logging.getLogger(__name__)
+
+
+# Filter arguments, matching the EmployeesTable filters
+FILTER_ARGS = {
+    FilterIndex.FIRST_NAME: "first_name",
+    FilterIndex.LAST_NAME: "last_name",
+    FilterIndex.EMPLOYEE_ID: "employee_id",
+    FilterIndex.POSITION: "position",
+    FilterIndex.CONTRACT: "contract",
+}
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+
+    parser.add_argument("output", help="The PDF to write, the directory or zip archive "
+                        "with --per-employee, or the export with --export or --totals")
+    parser.add_argument("--db", default=constants.DB_PATH, help="The database to read")
+
+    filters = parser.add_argument_group(
+        "filters", "Case-insensitive prefix filters on employee profiles"
+    )
+
+    for arg in FILTER_ARGS.values():
+        filters.add_argument(f"--{arg.replace('_', '-')}", dest=arg, default="")
+
+    parser.add_argument(
+        "--render-mode",
+        choices=[render_mode.name.lower() for render_mode in RenderMode],
+        default=RenderMode.TABLE.name.lower()
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Processes to render with")
+    parser.add_argument("--per-employee", action="store_true",
+                        help="Write one PDF per employee, named by employee id")
+    parser.add_argument("--zip", action="store_true",
+                        help="With --per-employee, write the PDFs into a zip archive")
+    parser.add_argument("--export", action="store_true",
+                        help="Export shifts as CSV, XLSX or JSONL, by the output's extension")
+    parser.add_argument("--totals", action="store_true",
+                        help="Export each employee's weekly and pay period hours as CSV")
+    parser.add_argument("--page-cache", metavar="PATH",
+                        help="Reuse unchanged pages from this cache (native mode only)")
+    parser.add_argument("--query-stats", action="store_true",
+                        help="Log the time and count of each database query on exit")
+    parser.add_argument("--latency-stats", metavar="PATH",
+                        help="Save the latency of each backend call to this JSON file")
+    parser.add_argument("--quiet", action="store_true", help="Only print errors")
+
+    return parser.parse_args(argv)
+
+
+def filter_employees(
+    employees: Iterable[Employee],
+    queries: dict[FilterIndex, str]
+) -> Iterator[Employee]:
+    for employee in employees:
+        if matches_queries(employee, queries):
+            yield employee
+
+
+def main(argv: list[str] = None) -> int:
+    args = parse_args(argv)
+
+    logging.basicConfig(
+        format=" %(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s",
+        level=logging.ERROR if args.quiet else logging.INFO
+    )
+
+    queries = {
+        filter_index: normalize_query(getattr(args, arg))
+        for filter_index, arg in FILTER_ARGS.items()
+    }
+
+    # Opening a missing database would create an empty one
+    if not os.path.exists(args.db):
+        print(f"error: database not found: {args.db}", file=sys.stderr)
+        return 1
+
+    if args.latency_stats:
+        latency_stats.enable()
+
+    render_mode = RenderMode[args.render_mode.upper()]
+    page_cache = PageCache(args.page_cache) if args.page_cache else None
+
+    db_handler = DatabaseHandler(args.db, QueryStats() if args.query_stats else None)
+
+    try:
+        backend = Backend(db_handler, page_cache)
+    except Exception:
+        _logger.exception("failed to initialize backend")
+        db_handler.close()
+        return 1
+
+    saved = 0
+
+    def handle_progress(drawn: int, total: int) -> None:
+        nonlocal saved
+        saved = drawn
+
+    employees = filter_employees(backend.iter_employees(), queries)
+
+    try:
+        if args.export:
+            backend.export_shifts(
+                args.output,
+                include=lambda employee: matches_queries(employee, queries)
+            )
+            _logger.info(f"exported shifts to {args.output}")
+            return 0
+
+        if args.totals:
+            backend.export_hours_totals(
+                args.output,
+                include=lambda employee: matches_queries(employee, queries)
+            )
+            _logger.info(f"exported hours totals to {args.output}")
+            return 0
+
+        if args.per_employee:
+            backend.save_employee_timesheets(
+                employees,
+                args.output,
+                as_zip=args.zip,
+                progress_callback=handle_progress,
+                workers=args.workers,
+                render_mode=render_mode
+            )
+        else:
+            backend.save_timesheet(
+                employees,
+                args.output,
+                progress_callback=handle_progress,
+                workers=args.workers,
+                render_mode=render_mode
+            )
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        backend.shutdown()
+
+        if args.latency_stats:
+            latency_stats.active.dump(args.latency_stats)
+
+    _logger.info(f"saved {saved} employees to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,35 @@
 """App-wide Constants"""
+import os
 import datetime
 import utils
 
 PAY_PERIOD_DAYS = 14
-DEFAULT_HOURS_REG = "8.00"
-DEFAULT_HOURS_OT = "0.00"
-DEFAULT_HOURS_WEEKEND = "0.00"
+PAY_PERIOD_WEEKS = PAY_PERIOD_DAYS // 7
+# Hours are in hundredths of an hour, so 800 is 8.00 hours
+DEFAULT_HOURS_REG = 800
+DEFAULT_HOURS_OT = 0
+DEFAULT_HOURS_WEEKEND = 0
 DEFAULT_TIME_IN = datetime.time(hour=9) # 9 AM
 DEFAULT_TIME_OUT = datetime.time(hour=17) # 5 PM
 
+# How times and dates are stored. Both are ISO 8601, which utils.decode_time
+# and decode_date rely on to decode them quickly
 TIME_FORMAT = "%H:%M"
 DATE_FORMAT = "%Y-%m-%d"
 
 DB_PATH = utils.load_file("assets/database.db")
+# Pages of unchanged employees are reused from here when reports are regenerated
+PAGE_CACHE_PATH = utils.load_file("assets/page_cache.db")
+
+# Set to 1 to log the time and count of each database query on exit
+QUERY_STATS = os.environ.get("TIMESHEET_QUERY_STATS") == "1"
+
+# Set to a path to record Backend method latencies, saved there as JSON on exit
+LATENCY_STATS_PATH = os.environ.get("TIMESHEET_LATENCY_STATS")
+
+# Set to 1 to log how long each phase of startup takes, up to the window showing
+STARTUP_TRACE = os.environ.get("TIMESHEET_STARTUP_TRACE") == "1"
+STARTUP_TARGET_MS = 500 # Time to first window
 
 APP_NAME = "Timesheet Generator"
 COMPANY_NAME = "Company Name"
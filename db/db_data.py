@@ -16,19 +16,39 @@ class PayPeriod:
     end_date: datetime.datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Shift:
     """
-    Shift details
+    Shift details. Slotted, since there is one for every day of every
+    employee's pay period. Hours are integer hundredths of an hour, formatted
+    only for display.
     """
     date: datetime.date
     time_in: Union[datetime.time, None] = constants.DEFAULT_TIME_IN
     time_out: Union[datetime.time, None] = constants.DEFAULT_TIME_OUT
-    hours_reg: str = constants.DEFAULT_HOURS_REG
-    hours_ot: str = constants.DEFAULT_HOURS_OT
+    hours_reg: int = constants.DEFAULT_HOURS_REG
+    hours_ot: int = constants.DEFAULT_HOURS_OT
 
 
-@dataclass
+@dataclass(slots=True)
+class HoursTotals:
+    """
+    An employee's regular and overtime hours for each week of the pay period,
+    in hundredths of an hour.
+    """
+    week_reg: list[int]
+    week_ot: list[int]
+
+    @property
+    def period_reg(self) -> int:
+        return sum(self.week_reg)
+
+    @property
+    def period_ot(self) -> int:
+        return sum(self.week_ot)
+
+
+@dataclass(slots=True)
 class Employee:
     """
     Employee details and their shifts
@@ -1,11 +1,16 @@
 """DatabaseHandler Class"""
 
+import sys
 import sqlite3
-from typing import Union
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Iterable, Iterator, Union
 
 import utils
 import constants
 from db.db_data import PayPeriod, Employee, Shift
+from db.query_stats import QueryStats, make_cursor_factory
 
 
 class DuplicateEmployeeID(Exception):
@@ -15,18 +20,75 @@ class DuplicateEmployeeID(Exception):
     """
 
 
+# Shifts share their decoded dates, times and hours, since a pay period only
+# has a few distinct values of each. utils.decode_date and decode_time share
+# dates and times.
+
+@lru_cache(maxsize=4096)
+def _share_hours(hours: int) -> int:
+    """
+    Returns the first equal hours decoded, so each distinct value is stored
+    once rather than as a new int per row.
+    """
+    return hours
+
+
+@lru_cache(maxsize=4096)
+def _intern(value: str) -> str:
+    """
+    Shares one copy of values that repeat between rows, like positions and
+    contracts.
+    """
+    return sys.intern(value)
+
+
 class DatabaseHandler:
     """
     Database Handler for interacting with the app's SQLite database.
     """
 
-    def __init__(self, db: str):
+    def __init__(self, db: str, query_stats: QueryStats = None):
+        """
+        :param db: The path of the database, or ":memory:".
+        :param query_stats: Optional. Records every statement run, for
+            finding the slowest or most frequent queries.
+        """
+        self.db = db
         self.conn = sqlite3.connect(db)
-        self.cur = self.conn.cursor()
+        self.query_stats = query_stats
+        self._thread_id = threading.get_ident()
+
+        if query_stats is not None:
+            self._cursor_factory = make_cursor_factory(query_stats)
+        else:
+            self._cursor_factory = sqlite3.Cursor
+
+        self.cur = self._create_cursor()
 
         # Enable foreign key constraints
         self.cur.execute("PRAGMA foreign_keys = ON;")
 
+    @contextmanager
+    def open_for_thread(self) -> Iterator["DatabaseHandler"]:
+        """
+        Get a handler usable on the calling thread. That's this handler on the
+        thread that created it, otherwise a new connection to the same
+        database, closed on exit. A RAM database can't be opened again.
+        """
+        if threading.get_ident() == self._thread_id:
+            yield self
+            return
+
+        db_handler = DatabaseHandler(self.db, self.query_stats)
+
+        try:
+            yield db_handler
+        finally:
+            db_handler.close()
+
+    def _create_cursor(self) -> sqlite3.Cursor:
+        return self.conn.cursor(self._cursor_factory)
+
     def create_settings_table(self) -> None:
         """
         Create a new `settings` table if one doesn't exist already.
@@ -75,29 +137,65 @@ class DatabaseHandler:
 
     def create_shift_table(self) -> None:
         """
-        Create a new `shift` table if one doesn't exist already.
+        Create a new `shift` table if one doesn't exist already. A table from
+        before hours were stored as hundredths is migrated.
         """
         if self._table_exists("shift"):
+            if self._get_column_type("shift", "hours_reg") == "TEXT":
+                self._migrate_shift_hours()
             return
 
         with self.conn:
+            self._create_shift_table()
+
+    def _create_shift_table(self) -> None:
+        # Hours are integer hundredths of an hour
+        self.cur.execute(
+            """
+            CREATE TABLE shift(
+                date TEXT,
+                time_in TEXT,
+                time_out TEXT,
+                hours_reg INTEGER,
+                hours_ot INTEGER,
+                employee_id TEXT REFERENCES employee(employee_id)
+                ON DELETE CASCADE
+            )
+            """
+        )
+
+        self.cur.execute(
+            "CREATE INDEX idx_employee_id ON shift (employee_id)"
+        )
+
+    def _migrate_shift_hours(self) -> None:
+        """
+        Rebuilds a `shift` table that stores hours as text, like "8.50", to
+        store them as hundredths. Empty hours become 0.
+
+        Runs in one explicit transaction. The sqlite3 module doesn't begin one
+        before DDL, so otherwise the rename would commit on its own, and a
+        failed copy would leave the shifts behind in `shift_text_hours`.
+        """
+        with self.conn: # Commits, or rolls back on an error
+            self.cur.execute("BEGIN")
+            self.cur.execute("ALTER TABLE shift RENAME TO shift_text_hours")
+            self.cur.execute("DROP INDEX IF EXISTS idx_employee_id")
+
+            self._create_shift_table()
+
             self.cur.execute(
                 """
-                CREATE TABLE shift(
-                    date TEXT,
-                    time_in TEXT,
-                    time_out TEXT,
-                    hours_reg TEXT,
-                    hours_ot TEXT,
-                    employee_id TEXT REFERENCES employee(employee_id)
-                    ON DELETE CASCADE
-                )
+                INSERT INTO shift
+                SELECT date, time_in, time_out,
+                    CAST(ROUND(COALESCE(hours_reg, 0) * 100) AS INTEGER),
+                    CAST(ROUND(COALESCE(hours_ot, 0) * 100) AS INTEGER),
+                    employee_id
+                FROM shift_text_hours
                 """
             )
 
-            self.cur.execute(
-                "CREATE INDEX idx_employee_id ON shift (employee_id)"
-            )
+            self.cur.execute("DROP TABLE shift_text_hours")
 
     def delete_settings_table(self) -> None:
         """
@@ -157,15 +255,15 @@ class DatabaseHandler:
             return None
 
         return PayPeriod(
-            start_date=utils.str_to_date(start_date, constants.DATE_FORMAT),
-            end_date=utils.str_to_date(end_date, constants.DATE_FORMAT)
+            start_date=utils.decode_date(start_date),
+            end_date=utils.decode_date(end_date)
         )
 
     def get_employees(self) -> list[Employee]:
         """
-        Get all employees.
+        Get all employees, ordered by first name, then employee id.
         """
-        res = self.cur.execute(f"SELECT * FROM employee ORDER BY first_name")
+        res = self.cur.execute("SELECT * FROM employee ORDER BY first_name, employee_id")
 
         rows = res.fetchall()
 
@@ -176,8 +274,8 @@ class DatabaseHandler:
                 employee_id=row[0],
                 first_name=row[1],
                 last_name=row[2],
-                position=row[3],
-                contract=row[4],
+                position=_intern(row[3]),
+                contract=_intern(row[4]),
                 shifts=[]
             )
 
@@ -188,6 +286,103 @@ class DatabaseHandler:
 
         return employees
 
+    def iter_employees(self, batch_size: int = 500) -> Iterator[Employee]:
+        """
+        Iterate over all employees in the same order as get_employees, fetching
+        rows in batches so only one batch is held in memory at a time.
+        """
+        # Own cursor, so fetching shifts doesn't reset the employee rows
+        cur = self._create_cursor()
+
+        try:
+            res = cur.execute("SELECT * FROM employee ORDER BY first_name, employee_id")
+
+            while rows := res.fetchmany(batch_size):
+                for row in rows:
+                    yield Employee(
+                        employee_id=row[0],
+                        first_name=row[1],
+                        last_name=row[2],
+                        position=_intern(row[3]),
+                        contract=_intern(row[4]),
+                        shifts=self._get_shifts(row[0])
+                    )
+        finally:
+            cur.close()
+
+    def iter_shift_rows(self, batch_size: int = 5000) -> Iterator[tuple]:
+        """
+        Iterate over the raw rows of every employee's shifts, as
+        (employee_id, first_name, last_name, position, contract,
+        date, time_in, time_out, hours_reg, hours_ot), with hours in
+        hundredths. Employees are ordered as in get_employees, each with their
+        shifts in date order. Employees without shifts get one row, with the
+        shift columns None.
+        """
+        cur = self._create_cursor()
+
+        try:
+            res = cur.execute(
+                """
+                SELECT e.employee_id, e.first_name, e.last_name, e.position, e.contract,
+                    s.date, s.time_in, s.time_out, s.hours_reg, s.hours_ot
+                FROM employee e
+                LEFT JOIN shift s ON s.employee_id = e.employee_id
+                ORDER BY e.first_name, e.employee_id, s.date
+                """
+            )
+
+            while rows := res.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cur.close()
+
+    def iter_hours_totals(
+        self,
+        pay_period: PayPeriod,
+        batch_size: int = 5000
+    ) -> Iterator[tuple]:
+        """
+        Iterate over each employee's hours totals for each week of the pay
+        period, summed by the database, as (employee_id, first_name,
+        last_name, position, contract, week, hours_reg, hours_ot). Weeks count
+        from 0 and hours are in hundredths. Employees are ordered as in
+        iter_shift_rows. Weeks without shifts have no row, and employees
+        without shifts in the pay period get one row, with week and hours None.
+        """
+        cur = self._create_cursor()
+
+        try:
+            res = cur.execute(
+                """
+                SELECT e.employee_id, e.first_name, e.last_name, e.position, e.contract,
+                    CAST((julianday(s.date) - julianday(:start_date)) / 7 AS INTEGER) AS week,
+                    SUM(s.hours_reg), SUM(s.hours_ot)
+                FROM employee e
+                LEFT JOIN shift s ON s.employee_id = e.employee_id
+                    AND s.date BETWEEN :start_date AND :end_date
+                GROUP BY e.employee_id, week
+                ORDER BY e.first_name, e.employee_id, week
+                """,
+                {
+                    "start_date": pay_period.start_date.strftime(constants.DATE_FORMAT),
+                    "end_date": pay_period.end_date.strftime(constants.DATE_FORMAT)
+                }
+            )
+
+            while rows := res.fetchmany(batch_size):
+                yield from rows
+        finally:
+            cur.close()
+
+    def count_employees(self) -> int:
+        """
+        Get the number of employees.
+        """
+        res = self.cur.execute("SELECT COUNT(*) FROM employee")
+
+        return res.fetchone()[0]
+
     def get_employee(self, employee_id: str) -> Union[Employee, None]:
         """
         Get the employee matching the id. If no match, returns None.
@@ -205,8 +400,8 @@ class DatabaseHandler:
             employee_id=employee_id,
             first_name=row[1],
             last_name=row[2],
-            position=row[3],
-            contract=row[4],
+            position=_intern(row[3]),
+            contract=_intern(row[4]),
             shifts=self._get_shifts(employee_id)
         )
 
@@ -249,6 +444,28 @@ class DatabaseHandler:
             for employee in employees:
                 self._add_employee(employee)
 
+    def add_employee_rows(
+        self,
+        employee_rows: Iterable[tuple],
+        shift_rows: Iterable[tuple]
+    ) -> None:
+        """
+        Bulk add raw rows in one transaction, for loading large amounts of
+        data. Employee rows are (employee_id, first_name, last_name, position,
+        contract) and shift rows are (date, time_in, time_out, hours_reg,
+        hours_ot, employee_id), formatted as stored, with hours in hundredths.
+        Shift rows may only refer to employees that exist once the employee rows
+        are added. If there is an employee with the same id, raises
+        DuplicateEmployeeID and nothing is added.
+        """
+        with self.conn:
+            try:
+                self.cur.executemany("INSERT INTO employee VALUES (?, ?, ?, ?, ?)", employee_rows)
+            except sqlite3.IntegrityError:
+                raise DuplicateEmployeeID
+
+            self.cur.executemany("INSERT INTO shift VALUES (?, ?, ?, ?, ?, ?)", shift_rows)
+
     def delete_employee(self, employee_id: str) -> None:
         """
         Delete an employee. Deletes all shifts as well. If an employee with this id
@@ -314,18 +531,12 @@ class DatabaseHandler:
         shifts = []
 
         for row in rows:
-            date = utils.str_to_date(row[0], constants.DATE_FORMAT)
-            time_in = utils.str_to_time(row[1], constants.TIME_FORMAT) if row[1] else None
-            time_out = utils.str_to_time(row[2], constants.TIME_FORMAT) if row[2] else None
-            hours_reg = row[3]
-            hours_ot = row[4]
-
             shift = Shift(
-                date=date,
-                time_in=time_in,
-                time_out=time_out,
-                hours_reg=hours_reg,
-                hours_ot=hours_ot,
+                date=utils.decode_date(row[0]),
+                time_in=utils.decode_time(row[1]),
+                time_out=utils.decode_time(row[2]),
+                hours_reg=_share_hours(row[3]),
+                hours_ot=_share_hours(row[4]),
             )
             shifts.append(shift)
 
@@ -409,6 +620,13 @@ class DatabaseHandler:
         for row in self.cur.execute("SELECT * FROM employee"):
             print(row)
 
+    def _get_column_type(self, table: str, column: str) -> Union[str, None]:
+        for row in self.cur.execute(f"PRAGMA table_info({table})"):
+            if row[1] == column:
+                return row[2].upper()
+
+        return None
+
     def _table_exists(self, name: str) -> bool:
         res = self.cur.execute(
             "SELECT name FROM sqlite_master WHERE name=:name", {"name": name}
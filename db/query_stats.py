@@ -0,0 +1,197 @@
+"""QueryStats Class for timing the SQL statements run by DatabaseHandler"""
+
+import time
+import heapq
+import sqlite3
+from dataclasses import dataclass
+from functools import lru_cache
+
+
+@dataclass
+class StatementStats:
+    """
+    Totals for one SQL statement, over every time it was run
+    """
+    sql: str
+    count: int = 0
+    total_seconds: float = 0
+    max_seconds: float = 0
+
+
+class QueryStats:
+    """
+    Records how often each SQL statement is run and how long it takes,
+    including fetching its rows. Statements that only differ by whitespace
+    are counted together, parameters are never recorded.
+    """
+
+    def __init__(self, slowest_limit: int = 10):
+        """
+        :param slowest_limit: Optional. The number of slowest single runs to keep.
+        """
+        self.slowest_limit = slowest_limit
+        self.reset()
+
+    def reset(self) -> None:
+        self.statements: dict[str, StatementStats] = {}
+        self._slowest: list[tuple[float, str]] = [] # Min-heap of (seconds, sql)
+
+    def record_time(self, sql: str, seconds: float, is_run: bool = True) -> None:
+        """
+        Adds time spent on a statement. If `is_run` is False, the time was
+        spent on a run already counted, like fetching its rows.
+        """
+        sql = _normalize_sql(sql)
+        stats = self.statements.get(sql)
+
+        if stats is None:
+            stats = self.statements[sql] = StatementStats(sql)
+
+        stats.total_seconds += seconds
+
+        if is_run:
+            stats.count += 1
+
+    def record_run(self, sql: str, seconds: float) -> None:
+        """
+        Records the total time of a finished run, for the slowest runs. The
+        time must already have been added with record_time.
+        """
+        sql = _normalize_sql(sql)
+        stats = self.statements.get(sql)
+
+        if stats is None: # Started before a reset
+            return
+
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, (seconds, sql))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, sql))
+
+    def get_statements(self) -> list[StatementStats]:
+        """
+        Get the stats of every statement, by most total time first.
+        """
+        return sorted(self.statements.values(), key=lambda s: s.total_seconds, reverse=True)
+
+    def get_slowest(self) -> list[tuple[float, str]]:
+        """
+        Get the slowest finished runs as (seconds, sql), slowest first.
+        """
+        return sorted(self._slowest, reverse=True)
+
+    def get_statement_count(self) -> int:
+        """
+        Get the number of statements run.
+        """
+        return sum(stats.count for stats in self.statements.values())
+
+    def format_report(self, limit: int = 10) -> str:
+        """
+        Formats the statements with the most total time as a table, followed
+        by the slowest single runs. Statements run once per row of another
+        query (N+1 patterns) stand out by their count.
+        """
+        statements = self.get_statements()
+        total_seconds = sum(stats.total_seconds for stats in statements)
+
+        lines = [
+            f"{self.get_statement_count()} statements, {len(statements)} distinct, "
+            f"{1000 * total_seconds:.1f} ms",
+            f"{'count':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9}  sql",
+        ]
+
+        for stats in statements[:limit]:
+            lines.append(
+                f"{stats.count:>8} {1000 * stats.total_seconds:>10.1f} "
+                f"{1000 * stats.total_seconds / max(stats.count, 1):>9.3f} "
+                f"{1000 * stats.max_seconds:>9.3f}  {_shorten(stats.sql)}"
+            )
+
+        lines.append("slowest:")
+
+        for seconds, sql in self.get_slowest():
+            lines.append(f"{1000 * seconds:>10.3f} ms  {_shorten(sql)}")
+
+        return "\n".join(lines)
+
+
+class QueryStatsCursor(sqlite3.Cursor):
+    """
+    Cursor that records the statements it runs in a QueryStats. A run's time
+    includes fetching its rows, with the fetch methods or by iterating the
+    cursor, so it is finished when the cursor runs the next statement or is
+    closed. Create with `make_cursor_factory`.
+    """
+    query_stats: QueryStats
+
+    _sql = None # Statement of the unfinished run, if any
+    _run_seconds = 0
+
+    def _finish_run(self) -> None:
+        if self._sql is not None:
+            self.query_stats.record_run(self._sql, self._run_seconds)
+            self._sql = None
+
+    def _timed(self, sql: str, method, *args):
+        self._finish_run()
+        start = time.perf_counter()
+
+        try:
+            return method(*args)
+        finally:
+            self._sql = sql
+            self._run_seconds = time.perf_counter() - start
+            self.query_stats.record_time(sql, self._run_seconds)
+
+    def _timed_fetch(self, method, *args):
+        start = time.perf_counter()
+
+        try:
+            return method(*args)
+        finally:
+            if self._sql is not None:
+                seconds = time.perf_counter() - start
+                self._run_seconds += seconds
+                self.query_stats.record_time(self._sql, seconds, is_run=False)
+
+    def execute(self, sql: str, parameters=()) -> "QueryStatsCursor":
+        return self._timed(sql, super().execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters) -> "QueryStatsCursor":
+        return self._timed(sql, super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        return self._timed_fetch(super().fetchone)
+
+    def fetchmany(self, size: int = 1):
+        return self._timed_fetch(super().fetchmany, size)
+
+    def fetchall(self):
+        return self._timed_fetch(super().fetchall)
+
+    def __next__(self):
+        return self._timed_fetch(super().__next__)
+
+    def close(self) -> None:
+        self._finish_run()
+        super().close()
+
+
+def make_cursor_factory(query_stats: QueryStats) -> type[QueryStatsCursor]:
+    """
+    Makes a cursor class, for `sqlite3.Connection.cursor`, that records in
+    the QueryStats.
+    """
+    return type("QueryStatsCursor", (QueryStatsCursor,), {"query_stats": query_stats})
+
+
+@lru_cache(maxsize=256)
+def _normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _shorten(sql: str, length: int = 100) -> str:
+    return sql if len(sql) <= length else sql[:length - 3] + "..."
@@ -0,0 +1,220 @@
+"""
+EmployeeFilter for narrowing a list of employees by profile prefixes.
+"""
+from bisect import bisect_left
+from enum import Enum
+from typing import Callable, Union
+
+from db.db_data import Employee
+
+
+class FilterIndex(Enum):
+    FIRST_NAME = 0
+    LAST_NAME = 1
+    EMPLOYEE_ID = 2
+    POSITION = 3
+    CONTRACT = 4
+
+
+FILTER_ATTRS = {
+    FilterIndex.FIRST_NAME: "first_name",
+    FilterIndex.LAST_NAME: "last_name",
+    FilterIndex.EMPLOYEE_ID: "employee_id",
+    FilterIndex.POSITION: "position",
+    FilterIndex.CONTRACT: "contract",
+}
+
+# Sorts after any character a key can contain, so `prefix + KEY_MAX` is an
+# upper bound for every key starting with `prefix`
+KEY_MAX = chr(0x10FFFF)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a query the same way EmployeesTable does before filtering.
+    """
+    return query.strip().lower()
+
+
+def matches_queries(employee: Employee, queries: dict[FilterIndex, Union[str, None]]) -> bool:
+    """
+    Checks one employee against normalized prefix queries, with the same
+    result as EmployeeFilter. For filtering employees as they are streamed.
+    """
+    return all(
+        getattr(employee, FILTER_ATTRS[filter_index]).lower().startswith(query)
+        for filter_index, query in queries.items()
+        if query
+    )
+
+
+class _FieldIndex:
+    """
+    Lowercase keys for one employee attribute, sorted once so that the rows
+    matching a prefix form a contiguous range of ranks.
+    """
+
+    def __init__(self, keys: list[str]):
+        self.rows = sorted(range(len(keys)), key=keys.__getitem__)
+        self.sorted_keys = [keys[row] for row in self.rows]
+        self.ranks = [0] * len(keys)
+
+        for rank, row in enumerate(self.rows):
+            self.ranks[row] = rank
+
+        self.query = None
+        self.lo = 0
+        self.hi = len(keys)
+
+    @property
+    def is_active(self) -> bool:
+        return bool(self.query)
+
+    def set_query(self, query: Union[str, None]) -> bool:
+        """
+        Updates the range of matching ranks. Returns True if the new range
+        is contained in the previous one.
+        """
+        narrows = self.query is not None and query is not None \
+            and query.startswith(self.query)
+
+        if narrows:
+            lo, hi = self.lo, self.hi
+        else:
+            lo, hi = 0, len(self.sorted_keys)
+
+        if query:
+            self.lo = bisect_left(self.sorted_keys, query, lo, hi)
+            self.hi = bisect_left(self.sorted_keys, query + KEY_MAX, self.lo, hi)
+        else:
+            self.lo, self.hi = lo, hi
+
+        self.query = query
+
+        return narrows
+
+    def contains(self, row: int) -> bool:
+        return self.lo <= self.ranks[row] < self.hi
+
+
+class EmployeeFilter:
+    """
+    Filters employees by case-insensitive prefix queries on their profile.
+
+    Keys are normalized once in `set_employees`. When every changed query
+    extends its previous value, only the rows that currently match are tested
+    again. Otherwise (or if that range of sorted keys is smaller), the rows of
+    the narrowest active query are tested against the others.
+    """
+
+    def __init__(self):
+        self._row_count = 0
+        self._fields = {}
+        self._matches = set()
+        self._queries = [None] * len(FilterIndex)
+
+        self.set_employees([])
+
+    def set_employees(self, employees: list[Employee]) -> None:
+        """
+        Precomputes the sorted keys for the employees and re-applies the
+        current queries.
+        """
+        self._row_count = len(employees)
+
+        self._fields = {
+            filter_index: _FieldIndex(
+                [getattr(employee, attr).lower() for employee in employees]
+            )
+            for filter_index, attr in FILTER_ATTRS.items()
+        }
+
+        for filter_index in FilterIndex:
+            self._fields[filter_index].set_query(self._queries[filter_index.value])
+
+        self._matches = self._compute_matches()
+
+    def set_query(self, filter_index: FilterIndex, query: Union[str, None]) -> None:
+        """
+        Sets the (normalized) prefix query for one attribute. None or "" matches
+        every employee.
+        """
+        self.set_queries({filter_index: query})
+
+    def set_queries(self, queries: dict[FilterIndex, Union[str, None]]) -> None:
+        """
+        Sets several queries at once, evaluating the filter a single time.
+        """
+        changed = []
+        all_narrow = True
+
+        for filter_index, query in queries.items():
+            if query == self._queries[filter_index.value]:
+                continue
+
+            self._queries[filter_index.value] = query
+
+            field = self._fields[filter_index]
+            all_narrow = field.set_query(query) and all_narrow
+            changed.append(field)
+
+        if not changed:
+            return
+
+        # Re-testing the current matches only pays off if there are fewer of
+        # them than rows in the narrowest range
+        if all_narrow and len(self._matches) <= self._narrowest_range_size():
+            self._matches = {
+                row for row in self._matches
+                if all(field.contains(row) for field in changed)
+            }
+        else:
+            self._matches = self._compute_matches()
+
+    def _active_fields(self) -> list[_FieldIndex]:
+        return [field for field in self._fields.values() if field.is_active]
+
+    def _narrowest_range_size(self) -> int:
+        return min(
+            (field.hi - field.lo for field in self._active_fields()),
+            default=self._row_count
+        )
+
+    def _compute_matches(self) -> set[int]:
+        active = self._active_fields()
+
+        if not active:
+            return set(range(self._row_count))
+
+        narrowest = min(active, key=lambda field: field.hi - field.lo)
+        others = [field for field in active if field is not narrowest]
+
+        return {
+            row for row in narrowest.rows[narrowest.lo:narrowest.hi]
+            if all(field.contains(row) for field in others)
+        }
+
+    def matches(self, row: int) -> bool:
+        return row in self._matches
+
+    def get_employee_matcher(self) -> Callable[[Employee], bool]:
+        """
+        Get a function checking any employee, like one streamed from the
+        database, against the current queries. Later query changes don't
+        affect it, so it can be used from another thread.
+        """
+        queries = {filter_index: self._queries[filter_index.value] for filter_index in FilterIndex}
+
+        return lambda employee: matches_queries(employee, queries)
+
+    def get_matching_row_set(self) -> set[int]:
+        """
+        Get the matching rows as a set. This should not be modified.
+        """
+        return self._matches
+
+    def get_matching_rows(self) -> list[int]:
+        """
+        Get the matching rows in ascending order.
+        """
+        return sorted(self._matches)
@@ -1,4 +1,4 @@
-from enum import Enum
+from typing import Callable
 
 from PySide6.QtWidgets import (
     QWidget, 
@@ -9,25 +9,22 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
-from db.db_data import Employee
+import utils
+from db.db_data import Employee, HoursTotals
+from gui.employee_filter import EmployeeFilter, FilterIndex, normalize_query
 
 
-HEADER_LABELS = ["First Name", "Last Name", "Employee No", "Job Title", "Contract"]
-
-
-class FilterIndex(Enum):
-    FIRST_NAME = 0
-    LAST_NAME = 1
-    EMPLOYEE_ID = 2
-    POSITION = 3
-    CONTRACT = 4
+HEADER_LABELS = [
+    "First Name", "Last Name", "Employee No", "Job Title", "Contract", "Reg. Hours", "OT Hours"
+]
 
 
 class EmployeesTable(QTableWidget):
     def __init__(self, parent: QWidget = None):
         super().__init__(parent)
         self.employees = []
-        self._filter_queries = [None] * len(FilterIndex)
+        self._employee_filter = EmployeeFilter()
+        self._visible_rows = set()
 
         self.setColumnCount(len(HEADER_LABELS))
         self.setHorizontalHeaderLabels(HEADER_LABELS)
@@ -37,7 +34,16 @@ class EmployeesTable(QTableWidget):
         for i in range(len(HEADER_LABELS)):
             self.horizontalHeader().setSectionResizeMode(i, QHeaderView.Stretch)
 
-    def populate_table(self, employees: list[Employee]) -> None:
+    def populate_table(
+        self,
+        employees: list[Employee],
+        hours_totals: dict[str, HoursTotals] = None
+    ) -> None:
+        """
+        :param hours_totals: Optional. Each employee's hours totals, by
+            employee id, like Backend.get_hours_totals returns. Without them,
+            totals are summed from the employees' shifts.
+        """
         self.employees = employees
 
         self.clearContents()
@@ -59,61 +65,95 @@ class EmployeesTable(QTableWidget):
                 qitem.setFlags(~Qt.ItemIsEditable)
 
                 self.setItem(row, col, qitem)
-        
+
+            if hours_totals is not None and employee.employee_id in hours_totals:
+                totals = hours_totals[employee.employee_id]
+                hours = [totals.period_reg, totals.period_ot]
+            else:
+                hours = [
+                    sum(shift.hours_reg for shift in employee.shifts),
+                    sum(shift.hours_ot for shift in employee.shifts)
+                ]
+
+            for col, hours_item in enumerate(hours, start=len(profile_items)):
+                qitem = QTableWidgetItem(utils.format_hours(hours_item))
+                qitem.setFlags(~Qt.ItemIsEditable)
+                qitem.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+
+                self.setItem(row, col, qitem)
+
+        self._visible_rows = set(range(len(employees)))
+        self._employee_filter.set_employees(employees)
+
         self._filter()
 
     def filter_by_first_name(self, name: str):
-        self._filter_by("first_name", FilterIndex.FIRST_NAME, name)
+        self._filter_by(FilterIndex.FIRST_NAME, name)
 
     def filter_by_last_name(self, name: str):
-        self._filter_by("last_name", FilterIndex.LAST_NAME, name)
+        self._filter_by(FilterIndex.LAST_NAME, name)
 
     def filter_by_position(self, position: str):
-        self._filter_by("position", FilterIndex.POSITION, position)
+        self._filter_by(FilterIndex.POSITION, position)
 
     def filter_by_id(self, employee_id: str):
-        self._filter_by("employee_id", FilterIndex.EMPLOYEE_ID, employee_id)
+        self._filter_by(FilterIndex.EMPLOYEE_ID, employee_id)
 
     def filter_by_contract(self, contract: str):
-        self._filter_by("contract", FilterIndex.CONTRACT, contract)
+        self._filter_by(FilterIndex.CONTRACT, contract)
 
-    def _filter_by(
+    def filter_by(
         self,
-        employee_attr: str,
-        filter_index: FilterIndex,
-        target: str
+        first_name: str = "",
+        last_name: str = "",
+        employee_id: str = "",
+        position: str = "",
+        contract: str = ""
     ) -> None:
-        normalized_target = self._normalize(target)
+        """
+        Applies all the profile filters at once, with a single filter pass.
+        """
+        self._employee_filter.set_queries({
+            FilterIndex.FIRST_NAME: self._normalize(first_name),
+            FilterIndex.LAST_NAME: self._normalize(last_name),
+            FilterIndex.EMPLOYEE_ID: self._normalize(employee_id),
+            FilterIndex.POSITION: self._normalize(position),
+            FilterIndex.CONTRACT: self._normalize(contract),
+        })
 
-        def query(employee: Employee) -> bool:
-            return getattr(employee, employee_attr).lower().startswith(normalized_target)
+        self._filter()
 
-        self._filter_queries[filter_index.value] = query
+    def _filter_by(self, filter_index: FilterIndex, target: str) -> None:
+        self._employee_filter.set_query(filter_index, self._normalize(target))
 
         self._filter()
 
     def _filter(self) -> None:
         self.setCurrentItem(None) # Clear the current selection
 
-        for row in range(self.rowCount()):
-            employee = self.get_employee_from_row(row)
+        # Only touch rows whose visibility changed
+        matching_rows = self._employee_filter.get_matching_row_set()
 
-            matches_queries = all(
-                query(employee) if query is not None else True \
-                for query in self._filter_queries
-            )
+        for row in self._visible_rows ^ matching_rows:
+            self.setRowHidden(row, row not in matching_rows)
 
-            self.setRowHidden(row, not matches_queries)
+        self._visible_rows = matching_rows
 
     def _normalize(self, val: str) -> str:
-        return val.strip().lower()
+        return normalize_query(val)
 
     def get_employee_from_row(self, row: int) -> Employee:
         return self.employees[row]
 
+    def get_employee_matcher(self) -> Callable[[Employee], bool]:
+        """
+        Get a function checking employees against the current filter, for
+        employees that aren't in the table's rows.
+        """
+        return self._employee_filter.get_employee_matcher()
+
     def get_employees_matching_filter(self) -> list[Employee]:
         return [
             self.get_employee_from_row(row)
-            for row in range(self.rowCount())
-            if not self.isRowHidden(row)
+            for row in self._employee_filter.get_matching_rows()
         ]
@@ -2,3 +2,5 @@ INTERNAL_ERR_MSG = "Hmm... Something went wrong."
 
 WINDOW_HEIGHT = 600
 WINDOW_WIDTH = 800
+
+FILTER_DEBOUNCE_MS = 150
@@ -78,8 +78,8 @@ class SettingsTabUI(QWidget):
         rows = [
             ("Default time in", constants.DEFAULT_TIME_IN.strftime("%I:%M %p")),
             ("Default time out", constants.DEFAULT_TIME_OUT.strftime("%I:%M %p")),
-            ("Default regular hours", constants.DEFAULT_HOURS_REG),
-            ("Default overtime hours", constants.DEFAULT_HOURS_OT)
+            ("Default regular hours", utils.format_hours(constants.DEFAULT_HOURS_REG)),
+            ("Default overtime hours", utils.format_hours(constants.DEFAULT_HOURS_OT))
         ]
 
         for i, row in enumerate(rows):
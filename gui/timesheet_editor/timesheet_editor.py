@@ -25,23 +25,32 @@ class TimesheetEditor(QWidget):
     def __init__(self, employee: Employee):
         super().__init__()
 
-        self._pages = self._build_pages(employee.shifts)
-        self._page_layout = self._create_page_layout()
+        self._page_shifts = self._split_shifts(employee.shifts)
+        self._pages = [None] * len(self._page_shifts) # Built on demand
+        self._page_layout = QStackedLayout()
 
         self._init_ui()
 
-    def _build_pages(self, shifts: list[Shift]) -> list[TimesheetPage]:
-        pages = []
-        total_shifts = len(shifts)
+        if len(self._pages) > 0:
+            self._switch_page(0)
 
-        for start_idx in range(0, total_shifts, SHIFTS_PER_PAGE):
-            end_idx = min(start_idx + SHIFTS_PER_PAGE, total_shifts) - 1
-            
-            page = TimesheetPage(shifts[start_idx:end_idx + 1])
+    def _split_shifts(self, shifts: list[Shift]) -> list[list[Shift]]:
+        return [
+            shifts[start_idx:start_idx + SHIFTS_PER_PAGE]
+            for start_idx in range(0, len(shifts), SHIFTS_PER_PAGE)
+        ]
 
-            pages.append(page)
+    def _get_page(self, idx: int) -> TimesheetPage:
+        """
+        Gets the page at the index, building it the first time it's needed.
+        """
+        if self._pages[idx] is None:
+            page = TimesheetPage(self._page_shifts[idx])
+
+            self._page_layout.addWidget(page)
+            self._pages[idx] = page
 
-        return pages
+        return self._pages[idx]
 
     def _create_paginator(self) -> QComboBox:
         paginator = QComboBox()
@@ -57,17 +66,6 @@ class TimesheetEditor(QWidget):
 
         return paginator
 
-    def _create_page_layout(self) -> QStackedLayout:
-        """
-        Creates a stacked layout for displaying multiple timesheet views.
-        """
-        layout = QStackedLayout()
-
-        for page in self._pages:
-            layout.addWidget(page)
-
-        return layout
-
     def _init_ui(self) -> None:
         box = QGroupBox("Timesheet")
 
@@ -90,7 +88,15 @@ class TimesheetEditor(QWidget):
         self.setLayout(container)
 
     def _switch_page(self, idx: int) -> None:
-        self._page_layout.setCurrentIndex(idx)
+        self._page_layout.setCurrentWidget(self._get_page(idx))
 
     def get_shifts(self) -> list[Shift]:
-        return [shift for page in self._pages for shift in page.get_shifts()]
+        """
+        Gets the shifts from every page. Pages that were never opened
+        return their original shifts.
+        """
+        return [
+            shift
+            for page, shifts in zip(self._pages, self._page_shifts)
+            for shift in (page.get_shifts() if page is not None else shifts)
+        ]
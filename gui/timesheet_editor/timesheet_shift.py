@@ -3,6 +3,7 @@ from datetime import datetime
 
 from PySide6.QtWidgets import QLabel, QLineEdit
 
+import utils
 import validation
 from db.db_data import Shift
 
@@ -43,8 +44,8 @@ class TimesheetShift:
 
         return edit
 
-    def _create_hours_edit(self, hours: str) -> QLineEdit:
-        edit = QLineEdit(hours)
+    def _create_hours_edit(self, hours: int) -> QLineEdit:
+        edit = QLineEdit(utils.format_hours(hours))
 
         edit.editingFinished.connect(lambda: self._handle_hours_input(edit))
         edit.textChanged.connect(lambda: self._clear_error_outline(edit))
@@ -83,12 +84,7 @@ class TimesheetShift:
         Formats hours. For example, if the hours is "5", the value after
         formatting will be "5.00".
         """
-        hours = edit.text()
-
-        if hours in {"", "."}:
-            edit.setText("0.00")
-        else:
-            edit.setText("{:.2f}".format(float(hours)))
+        edit.setText(utils.format_hours(utils.parse_hours(edit.text())))
 
     def _strip(self, edit: QLineEdit) -> None:
         edit.setText(edit.text().strip())
@@ -109,13 +105,13 @@ class TimesheetShift:
         text = time_edit.text()
         return datetime.strptime(text, TIME_FORMAT).time() if text else None
 
-    def _get_hours(self, hours_edit: QLineEdit) -> str:
+    def _get_hours(self, hours_edit: QLineEdit) -> int:
         text = hours_edit.text()
 
         if not validation.validate_hours(text):
             raise ValueError
 
-        return text
+        return utils.parse_hours(text)
 
     def get_shift(self) -> Shift:
         """
@@ -0,0 +1,53 @@
+"""
+ExportWorker for exporting shifts off the UI thread.
+"""
+from typing import Protocol, Callable
+
+from PySide6.QtCore import QObject, Signal
+
+from db.db_data import Employee
+
+
+# -------------------- INTERFACES [START] --------------------
+
+
+class ExportService(Protocol):
+    def export_shifts(
+        self,
+        file_path: str,
+        include: Callable[[Employee], bool] = None
+    ) -> None:
+        ...
+
+
+# -------------------- INTERFACES [END] --------------------
+
+
+class ExportWorker(QObject):
+    """
+    Exports the shifts of the employees `include` returns True for. Meant to
+    be moved to a QThread, with `run` connected to the thread's `started`
+    signal. Either `saved` or `failed` is emitted when the export is finished.
+    """
+    saved = Signal(str) # File path
+    failed = Signal()
+
+    def __init__(
+        self,
+        service: ExportService,
+        file_path: str,
+        include: Callable[[Employee], bool]
+    ):
+        super().__init__()
+
+        self._service = service
+        self._file_path = file_path
+        self._include = include
+
+    def run(self) -> None:
+        try:
+            self._service.export_shifts(self._file_path, include=self._include)
+        except Exception:
+            self.failed.emit()
+        else:
+            self.saved.emit(self._file_path)
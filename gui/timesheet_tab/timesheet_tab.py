@@ -1,17 +1,22 @@
-from typing import Protocol
+from typing import Protocol, Callable
 
-from PySide6.QtWidgets import QWidget, QPushButton, QMessageBox, QLayout
-from PySide6.QtCore import Signal
+from PySide6.QtWidgets import (
+    QWidget,
+    QPushButton,
+    QMessageBox,
+    QLayout,
+    QProgressDialog
+)
+from PySide6.QtCore import Qt, Signal, QThread
 
 from gui import gui_utils
 from gui import gui_constants
-from gui.employee_editor.employee_editor_ui import EmployeeEditorUI, EditorMode
-from gui.employee_editor.employee_editor import EmployeeEditor
-from gui.employee_importer.employee_importer_ui import EmployeeImporterUI
-from gui.employee_importer.employee_importer import EmployeeImporter
 from gui.employees_table import EmployeesTable
+from gui.timesheet_tab.timesheet_worker import TimesheetWorker
+from gui.timesheet_tab.export_worker import ExportWorker
 
-from db.db_data import Employee
+from backend.render_mode import RenderMode
+from db.db_data import Employee, HoursTotals
 
 
 # -------------------- INTERFACES [START] --------------------
@@ -39,10 +44,27 @@ class EmployeeService(Protocol):
     def get_employees(self) -> list[Employee]:
         ...
 
+    def get_hours_totals(self) -> dict[str, HoursTotals]:
+        ...
+
+    def export_shifts(
+        self,
+        file_path: str,
+        include: Callable[[Employee], bool] = None
+    ) -> None:
+        ...
+
     def create_blank_employee(self) -> Employee:
         ...
     
-    def save_timesheet(self, employees: list[Employee], file_path: str) -> None:
+    def save_timesheet(
+        self,
+        employees: list[Employee],
+        file_path: str,
+        progress_callback: Callable[[int, int], None] = None,
+        is_cancelled: Callable[[], bool] = None,
+        render_mode: RenderMode = RenderMode.TABLE
+    ) -> None:
         ...
 
 
@@ -55,6 +77,10 @@ class TimesheetTabUI(Protocol):
     def pdf_filename_selected(self) -> Signal:
         ...
 
+    @property
+    def export_filename_selected(self) -> Signal:
+        ...
+
     @property
     def delete_all_employees_btn(self) -> QPushButton:
         ...
@@ -84,6 +110,11 @@ class TimesheetTab(QWidget):
         self._ui = ui
         self.setLayout(self._ui.layout())
 
+        # Report generation or export in progress, if any
+        self._report_thread = None
+        self._report_worker = None
+        self._report_progress = None
+
         self._init_conns()
 
         self.refresh_tab()
@@ -91,11 +122,18 @@ class TimesheetTab(QWidget):
     def _init_conns(self) -> None:
         self._ui.table.cellDoubleClicked.connect(self._handle_edit_employee)
         self._ui.pdf_filename_selected.connect(self._handle_download_pdf)
+        self._ui.export_filename_selected.connect(self._handle_export_shifts)
         self._ui.delete_all_employees_btn.clicked.connect(self._handle_delete_employees)
         self._ui.import_btn.clicked.connect(self._handle_import_employees)
         self._ui.add_employee_btn.clicked.connect(self._handle_add_employee)
 
+    # The editor and importer windows are imported when first opened, so they
+    # don't slow down startup
+
     def _handle_edit_employee(self, row: int, _: int) -> None:
+        from gui.employee_editor.employee_editor_ui import EmployeeEditorUI, EditorMode
+        from gui.employee_editor.employee_editor import EmployeeEditor
+
         employee = self._ui.table.get_employee_from_row(row)
 
         editor_ui = EmployeeEditorUI(EditorMode.EDIT, employee)
@@ -109,6 +147,9 @@ class TimesheetTab(QWidget):
         self.window_popup.show()
 
     def _handle_add_employee(self) -> None:
+        from gui.employee_editor.employee_editor_ui import EmployeeEditorUI, EditorMode
+        from gui.employee_editor.employee_editor import EmployeeEditor
+
         employee = self._service.create_blank_employee()
 
         editor_ui = EmployeeEditorUI(EditorMode.CREATE, employee)
@@ -122,6 +163,9 @@ class TimesheetTab(QWidget):
         self.window_popup.show()
 
     def _handle_import_employees(self) -> None:
+        from gui.employee_importer.employee_importer_ui import EmployeeImporterUI
+        from gui.employee_importer.employee_importer import EmployeeImporter
+
         importer_ui = EmployeeImporterUI()
         importer = EmployeeImporter(importer_ui, self._service)
 
@@ -155,22 +199,91 @@ class TimesheetTab(QWidget):
             gui_utils.show_dialog(gui_utils.DialogType.INFO, "Employees deleted.")
 
     def _handle_download_pdf(self, file_path: str) -> None:
-        if file_path == "":
+        if file_path == "" or self._report_thread is not None:
             return
 
         employees = self._ui.table.get_employees_matching_filter()
 
-        try:
-            self._service.save_timesheet(employees, file_path)
-        except Exception:
-            gui_utils.show_dialog(
-                gui_utils.DialogType.ERR, gui_constants.INTERNAL_ERR_MSG
-            )
+        self._report_progress = QProgressDialog(
+            "Generating timesheet...", "Cancel", 0, len(employees), self
+        )
+        self._report_progress.setWindowModality(Qt.WindowModal)
+        self._report_progress.setAutoClose(False)
+        self._report_progress.setAutoReset(False)
+
+        self._report_thread = QThread()
+        self._report_worker = TimesheetWorker(self._service, employees, file_path)
+        self._report_worker.moveToThread(self._report_thread)
+
+        self._report_thread.started.connect(self._report_worker.run)
+        self._report_worker.progressed.connect(self._handle_report_progress)
+        self._report_worker.saved.connect(self._handle_report_saved)
+        self._report_worker.cancelled.connect(self._finish_report)
+        self._report_worker.failed.connect(self._handle_report_failed)
+        self._report_progress.canceled.connect(self._handle_report_cancel)
+
+        self._report_thread.start()
+        self._report_progress.show()
+
+    def _handle_export_shifts(self, file_path: str) -> None:
+        if file_path == "" or self._report_thread is not None:
             return
 
+        # Busy indicator, an export doesn't report progress or cancel
+        self._report_progress = QProgressDialog("Exporting shifts...", None, 0, 0, self)
+        self._report_progress.setWindowModality(Qt.WindowModal)
+
+        self._report_thread = QThread()
+        self._report_worker = ExportWorker(
+            self._service, file_path, self._ui.table.get_employee_matcher()
+        )
+        self._report_worker.moveToThread(self._report_thread)
+
+        self._report_thread.started.connect(self._report_worker.run)
+        self._report_worker.saved.connect(self._handle_export_saved)
+        self._report_worker.failed.connect(self._handle_report_failed)
+
+        self._report_thread.start()
+        self._report_progress.show()
+
+    def _handle_report_progress(self, drawn: int, _: int) -> None:
+        if self._report_progress is not None:
+            self._report_progress.setValue(drawn)
+
+    def _handle_report_cancel(self) -> None:
+        # Called directly, the worker's thread is busy and can't process events
+        if self._report_worker is not None:
+            self._report_worker.cancel()
+
+    def _finish_report(self) -> None:
+        self._report_thread.quit()
+        self._report_thread.wait()
+
+        self._report_progress.close()
+
+        self._report_thread = None
+        self._report_worker = None
+        self._report_progress = None
+
+    def _handle_report_failed(self) -> None:
+        self._finish_report()
+
+        gui_utils.show_dialog(
+            gui_utils.DialogType.ERR, gui_constants.INTERNAL_ERR_MSG
+        )
+
+    def _handle_report_saved(self, file_path: str) -> None:
+        self._finish_report()
+        self._show_saved_dialog("PDF saved.", file_path)
+
+    def _handle_export_saved(self, file_path: str) -> None:
+        self._finish_report()
+        self._show_saved_dialog("Shifts exported.", file_path)
+
+    def _show_saved_dialog(self, message: str, file_path: str) -> None:
         choice = gui_utils.show_dialog(
             gui_utils.DialogType.INFO,
-            "PDF saved.",
+            message,
             buttons=[
                 ("View File", QMessageBox.AcceptRole),
                 ("OK", QMessageBox.ActionRole)
@@ -188,9 +301,10 @@ class TimesheetTab(QWidget):
     def refresh_tab(self) -> None:
         try:
             employees = self._service.get_employees()
+            hours_totals = self._service.get_hours_totals()
         except Exception:
             gui_utils.show_dialog(
                 gui_utils.DialogType.ERR, gui_constants.INTERNAL_ERR_MSG
             )
         else:
-            self._ui.table.populate_table(employees)
+            self._ui.table.populate_table(employees, hours_totals)
@@ -8,30 +8,48 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QFileDialog
 )
-from PySide6.QtCore import Qt, QSize, Signal
+from PySide6.QtCore import Qt, QSize, QTimer, Signal
 from PySide6.QtGui import QIcon
 
 from gui import gui_utils
+from gui import gui_constants
 from gui.employees_table import EmployeesTable
 from gui.employee_profile import EmployeeProfile
 
 import utils
 
 
+# Save dialog filters, with the extension added when the file name has none
+EXPORT_FILTERS = {
+    "CSV (*.csv)": ".csv",
+    "Excel Workbook (*.xlsx)": ".xlsx",
+    "JSON Lines (*.jsonl)": ".jsonl",
+}
+
+
 class TimesheetTabUI(QWidget):
     pdf_filename_selected = Signal(str)
+    export_filename_selected = Signal(str)
 
     def __init__(self):
         super().__init__()
 
         self.table = EmployeesTable()
 
+        # Coalesces filter edits so the table is filtered once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(gui_constants.FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self._apply_filter)
+
         self.download_pdf_btn = self._create_pdf_btn()
+        self.export_shifts_btn = self._create_export_btn()
         self.delete_all_employees_btn = QPushButton("Delete All Employees")
         self.import_btn = QPushButton("Import Employees")
         self.add_employee_btn = QPushButton("Add Employee")
 
         self.download_pdf_btn.clicked.connect(self._handle_download_pdf)
+        self.export_shifts_btn.clicked.connect(self._handle_export_shifts)
 
         self._init_ui()
 
@@ -40,7 +58,7 @@ class TimesheetTabUI(QWidget):
 
         layout.addLayout(self._create_header_layout())
         layout.addWidget(self._create_filter())
-        layout.addWidget(self.download_pdf_btn, alignment=Qt.AlignRight)
+        layout.addLayout(self._create_top_btns_layout())
         layout.addWidget(self.table)
         layout.addLayout(self._create_bottom_btns_layout())
 
@@ -66,14 +84,29 @@ class TimesheetTabUI(QWidget):
         filter_ = EmployeeProfile() # filter is a keyword
         filter_.setTitle("Filter")
 
-        filter_.first_name_edit.textChanged.connect(self.table.filter_by_first_name)
-        filter_.last_name_edit.textChanged.connect(self.table.filter_by_last_name)
-        filter_.id_edit.textChanged.connect(self.table.filter_by_id)
-        filter_.position_edit.textChanged.connect(self.table.filter_by_position)
-        filter_.contract_edit.textChanged.connect(self.table.filter_by_contract)
+        # Restarting the timer cancels any pending filter evaluation
+        for edit in [
+            filter_.first_name_edit,
+            filter_.last_name_edit,
+            filter_.id_edit,
+            filter_.position_edit,
+            filter_.contract_edit
+        ]:
+            edit.textChanged.connect(lambda _: self._filter_timer.start())
+
+        self._filter_profile = filter_
 
         return filter_
 
+    def _apply_filter(self) -> None:
+        self.table.filter_by(
+            first_name=self._filter_profile.first_name_edit.text(),
+            last_name=self._filter_profile.last_name_edit.text(),
+            employee_id=self._filter_profile.id_edit.text(),
+            position=self._filter_profile.position_edit.text(),
+            contract=self._filter_profile.contract_edit.text()
+        )
+
     def _create_pdf_btn(self) -> QPushButton:
         btn = QPushButton("Download Timesheet")
         btn.setToolTip(
@@ -88,6 +121,24 @@ class TimesheetTabUI(QWidget):
 
         return btn
 
+    def _create_export_btn(self) -> QPushButton:
+        btn = QPushButton("Export Shifts")
+        btn.setToolTip(
+            "Export the shifts of employees matching the current filter as CSV, XLSX or JSONL."
+        )
+
+        return btn
+
+    def _create_top_btns_layout(self) -> QHBoxLayout:
+        layout = QHBoxLayout()
+        spacer = QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum)
+
+        layout.addItem(spacer)
+        layout.addWidget(self.export_shifts_btn)
+        layout.addWidget(self.download_pdf_btn)
+
+        return layout
+
     def _create_bottom_btns_layout(self) -> QHBoxLayout:
         layout = QHBoxLayout()
         spacer = QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum)
@@ -99,10 +150,41 @@ class TimesheetTabUI(QWidget):
 
         return layout
 
+    def _flush_filter(self) -> None:
+        """
+        Applies a pending filter evaluation immediately.
+        """
+        if self._filter_timer.isActive():
+            self._filter_timer.stop()
+            self._apply_filter()
+
     def _handle_download_pdf(self) -> None:
+        self._flush_filter()
+
         file_path = self._open_file_saver()
         self.pdf_filename_selected.emit(file_path)
 
+    def _handle_export_shifts(self) -> None:
+        self._flush_filter()
+
+        file_path = self._open_export_file_saver()
+        self.export_filename_selected.emit(file_path)
+
+    def _open_export_file_saver(self) -> str:
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            parent=self,
+            caption="Export Shifts",
+            dir=gui_utils.get_home_dir(),
+            filter=";;".join(EXPORT_FILTERS)
+        )
+
+        extension = EXPORT_FILTERS.get(selected_filter, ".csv")
+
+        if file_path and not file_path.lower().endswith(tuple(EXPORT_FILTERS.values())):
+            file_path += extension
+
+        return file_path
+
     def _open_file_saver(self) -> None:
         response = QFileDialog.getSaveFileName(
             parent=self,
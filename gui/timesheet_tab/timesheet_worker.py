@@ -0,0 +1,79 @@
+"""
+TimesheetWorker for generating a timesheet report off the UI thread.
+"""
+import threading
+from typing import Protocol, Callable
+
+from PySide6.QtCore import QObject, Signal
+
+from backend.backend import ReportCancelled
+from backend.render_mode import RenderMode
+from db.db_data import Employee
+
+
+# -------------------- INTERFACES [START] --------------------
+
+
+class TimesheetService(Protocol):
+    def save_timesheet(
+        self,
+        employees: list[Employee],
+        file_path: str,
+        progress_callback: Callable[[int, int], None] = None,
+        is_cancelled: Callable[[], bool] = None,
+        render_mode: RenderMode = RenderMode.TABLE
+    ) -> None:
+        ...
+
+
+# -------------------- INTERFACES [END] --------------------
+
+
+class TimesheetWorker(QObject):
+    """
+    Saves a timesheet report. Meant to be moved to a QThread, with `run`
+    connected to the thread's `started` signal. Exactly one of `saved`,
+    `cancelled` or `failed` is emitted when the report is finished.
+
+    Reports are drawn in NATIVE mode, so regenerating a report reuses the
+    pages of unchanged employees from the backend's page cache.
+    """
+    progressed = Signal(int, int) # Employees drawn, total employees
+    saved = Signal(str) # File path
+    cancelled = Signal()
+    failed = Signal()
+
+    def __init__(
+        self,
+        service: TimesheetService,
+        employees: list[Employee],
+        file_path: str
+    ):
+        super().__init__()
+
+        self._service = service
+        self._employees = employees
+        self._file_path = file_path
+        self._cancel_event = threading.Event()
+
+    def run(self) -> None:
+        try:
+            self._service.save_timesheet(
+                self._employees,
+                self._file_path,
+                progress_callback=self.progressed.emit,
+                is_cancelled=self._cancel_event.is_set,
+                render_mode=RenderMode.NATIVE
+            )
+        except ReportCancelled:
+            self.cancelled.emit()
+        except Exception:
+            self.failed.emit()
+        else:
+            self.saved.emit(self._file_path)
+
+    def cancel(self) -> None:
+        """
+        Requests cancellation. Safe to call from any thread.
+        """
+        self._cancel_event.set()
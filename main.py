@@ -1,12 +1,27 @@
+from startup_trace import StartupTrace
+
+startup_trace = StartupTrace() # Created first, so imports are timed too
+
 import sys
 import logging
 from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+
+startup_trace.mark("import Qt")
 
 import constants
 from db.db_handler import DatabaseHandler
+from db.query_stats import QueryStats
 from backend.backend import Backend
+from backend.page_cache import PageCache
+from backend import latency_stats
+
+startup_trace.mark("import backend")
+
 from gui.main_window import MainWindow
 
+startup_trace.mark("import GUI")
+
 
 logging.basicConfig(
     format=" %(asctime)s %(levelname)s [%(filename)s:%(lineno)d] %(message)s"
@@ -18,21 +33,48 @@ logging.getLogger().setLevel(logging.INFO)
 _logger = logging.getLogger(__name__)
 
 
+def log_startup_trace() -> None:
+    startup_trace.mark("show window")
+    _logger.info(
+        "startup trace:\n"
+        + startup_trace.format_report(constants.STARTUP_TARGET_MS)
+    )
+
+
 if __name__ == "__main__":
-    db_handler = DatabaseHandler(constants.DB_PATH)
+    if constants.LATENCY_STATS_PATH:
+        latency_stats.enable()
+
+    db_handler = DatabaseHandler(
+        constants.DB_PATH, QueryStats() if constants.QUERY_STATS else None
+    )
 
     try:
-        backend = Backend(db_handler)
+        backend = Backend(db_handler, PageCache(constants.PAGE_CACHE_PATH))
     except Exception as e:
         _logger.exception("failed to initialize backend. terminating program")
         sys.exit(1)
 
+    startup_trace.mark("init backend")
+
     app = QApplication(sys.argv)
 
+    startup_trace.mark("init Qt")
+
     main_window = MainWindow(backend)
+
+    startup_trace.mark("create window")
+
     main_window.show()
 
+    # Runs once the event loop has shown the window
+    if constants.STARTUP_TRACE:
+        QTimer.singleShot(0, log_startup_trace)
+
     # Run the event loop
     app.exec()
 
     backend.shutdown()
+
+    if constants.LATENCY_STATS_PATH:
+        latency_stats.active.dump(constants.LATENCY_STATS_PATH)
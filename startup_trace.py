@@ -0,0 +1,38 @@
+"""StartupTrace Class for timing the phases of app startup"""
+
+import time
+
+
+class StartupTrace:
+    """
+    Records how long each phase of startup takes, from when the trace is
+    created to each call to `mark`. Recording is cheap, so it is always on and
+    only reported when asked for.
+    """
+
+    def __init__(self):
+        self.phases: list[tuple[str, float]] = [] # Phase, seconds
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase: str) -> None:
+        """
+        Ends a phase, started by the previous mark or the trace's creation.
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def get_total_seconds(self) -> float:
+        return self._last - self._start
+
+    def format_report(self, target_ms: float = None) -> str:
+        lines = [f"{1000 * seconds:>8.1f} ms  {phase}" for phase, seconds in self.phases]
+        total_ms = 1000 * self.get_total_seconds()
+
+        if target_ms is None:
+            lines.append(f"{total_ms:>8.1f} ms  total")
+        else:
+            result = "within" if total_ms <= target_ms else "over"
+            lines.append(f"{total_ms:>8.1f} ms  total, {result} the {target_ms:.0f} ms target")
+
+        return "\n".join(lines)
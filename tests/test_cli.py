@@ -0,0 +1,91 @@
+import sys
+import csv
+import datetime
+import subprocess
+
+import cli
+from db.db_handler import DatabaseHandler
+from db.db_data import PayPeriod
+from tests.test_generate_timesheet import make_employee, page_texts
+
+
+def make_db(path: str) -> None:
+    db_handler = DatabaseHandler(path)
+    db_handler.create_settings_table()
+    db_handler.create_employee_table()
+    db_handler.create_shift_table()
+
+    # Without a pay period, the backend would reset the employees
+    db_handler.update_pay_period(PayPeriod(
+        start_date=datetime.date(year=2024, month=7, day=1),
+        end_date=datetime.date(year=2024, month=7, day=14)
+    ))
+
+    for i in range(4):
+        employee = make_employee(str(i))
+        employee.position = "Ornithologist" if i % 2 == 0 else "Zoologist"
+        db_handler.add_employee(employee)
+
+    db_handler.close()
+
+
+def test_filters(tmp_path):
+    db_path, pdf_path = str(tmp_path / "test.db"), tmp_path / "out.pdf"
+    make_db(db_path)
+
+    assert cli.main([str(pdf_path), "--db", db_path, "--position", " ZOO", "--quiet"]) == 0
+
+    texts = page_texts(pdf_path.read_bytes())
+
+    assert len(texts) == 2
+    assert all("Zoologist" in text for text in texts)
+
+
+def test_export(tmp_path):
+    db_path, csv_path = str(tmp_path / "test.db"), tmp_path / "out.csv"
+    make_db(db_path)
+
+    assert cli.main([str(csv_path), "--db", db_path, "--position", "orn", "--export", "--quiet"]) == 0
+
+    with open(csv_path, newline="") as file:
+        rows = list(csv.reader(file))
+
+    assert {row[0] for row in rows[1:]} == {"0", "2"}
+    assert len(rows) == 1 + 2 * len(make_employee("0").shifts)
+
+
+def test_totals(tmp_path):
+    db_path, csv_path = str(tmp_path / "test.db"), tmp_path / "totals.csv"
+    make_db(db_path)
+
+    assert cli.main([str(csv_path), "--db", db_path, "--position", "orn", "--totals", "--quiet"]) == 0
+
+    with open(csv_path, newline="") as file:
+        rows = list(csv.reader(file))
+
+    assert rows[0][-2:] == ["Period Reg.", "Period OT"]
+    assert [row[0] for row in rows[1:]] == ["0", "2"]
+    assert rows[1][5:] == ["56.00", "9.50", "56.00", "10.50", "112.00", "20.00"]
+
+
+def test_totals_not_csv(tmp_path, capsys):
+    db_path = str(tmp_path / "test.db")
+    make_db(db_path)
+
+    assert cli.main([str(tmp_path / "totals.xlsx"), "--db", db_path, "--totals", "--quiet"]) == 1
+    assert "CSV" in capsys.readouterr().err
+
+
+def test_does_not_import_qt():
+    code = "import sys, cli; print(any(name.startswith('PySide6') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
+
+
+def test_does_not_import_reportlab():
+    """reportlab is imported when the first report is saved"""
+    code = "import sys, cli; print(any(name.startswith('reportlab') for name in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "False"
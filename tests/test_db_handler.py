@@ -1,5 +1,6 @@
 import sqlite3
 import datetime
+import threading
 import pytest
 
 from db.db_handler import DatabaseHandler, DuplicateEmployeeID
@@ -84,7 +85,7 @@ def test_add_shifts__success(db_handler: DatabaseHandler, employee: Employee):
         Shift(
             date=datetime.date(year=2024, month=7, day=20),
             time_out=datetime.time(hour=19),
-            hours_ot="2.00"
+            hours_ot=200
         )
     ]
 
@@ -117,11 +118,11 @@ def test_update_shift(db_handler: DatabaseHandler, employee: Employee):
     shift = Shift(
         date=datetime.date(year=2024, month=7, day=20),
         time_out=datetime.time(hour=12),
-        hours_reg="3.00"
+        hours_reg=300
     )
     db_handler._add_shift(employee.employee_id, shift)
 
-    shift.hours_reg = "8.00"
+    shift.hours_reg = 800
 
     db_handler._update_shift(employee.employee_id, shift)
 
@@ -166,3 +167,195 @@ def test_delete_employee(db_handler: DatabaseHandler,  employee: Employee):
 
     assert db_handler.get_employee(employee.employee_id) is None
     assert db_handler._get_shifts(employee.employee_id) == []
+
+
+def test_iter_employees(db_handler: DatabaseHandler, employee: Employee):
+    """Test iterating employees in batches matches get_employees"""
+
+    for i in range(5):
+        employee.employee_id = str(i)
+        employee.first_name = f"Alissa{4 - i}"
+        employee.shifts = [Shift(date=datetime.date(year=2024, month=7, day=20 + i))]
+        db_handler.add_employee(employee)
+
+    assert list(db_handler.iter_employees(batch_size=2)) == db_handler.get_employees()
+    assert db_handler.count_employees() == 5
+
+
+def test_iter_shift_rows(db_handler: DatabaseHandler, employee: Employee):
+    """Test shift rows are grouped by employee, in the order of get_employees"""
+
+    employee.shifts = [
+        Shift(date=datetime.date(year=2024, month=7, day=2), hours_reg=800),
+        Shift(date=datetime.date(year=2024, month=7, day=1), time_in=datetime.time(hour=9))
+    ]
+    db_handler.add_employee(employee)
+    db_handler.add_employee(Employee("2", "Aaron", "Moss", "Pilot", "Part-time", shifts=[]))
+
+    rows = list(db_handler.iter_shift_rows(batch_size=1))
+
+    assert [row[:2] for row in rows] == [("2", "Aaron"), ("1", "Alissa"), ("1", "Alissa")]
+    assert rows[0][5:] == (None,) * 5
+    assert rows[1][5:7] == ("2024-07-01", "09:00")
+    assert rows[2][5] == "2024-07-02" and rows[2][8] == 800
+
+
+def test_add_employee_rows__duplicate(db_handler: DatabaseHandler, employee: Employee):
+    """Test a duplicate id in a bulk add adds nothing"""
+
+    db_handler.add_employee(employee)
+
+    with pytest.raises(DuplicateEmployeeID):
+        db_handler.add_employee_rows(
+            [("2", "Aaron", "Moss", "Pilot", "Part-time"), ("1", "A", "B", "C", "D")],
+            [("2024-07-01", None, None, 0, 0, "2")]
+        )
+
+    assert db_handler.get_employees() == [employee]
+
+
+def test_get_employees_share_values(db_handler: DatabaseHandler, employee: Employee):
+    """Test loaded shifts are slotted and share their dates and hours"""
+
+    for i in range(2):
+        employee.employee_id = str(i)
+        employee.shifts = [Shift(date=datetime.date(year=2024, month=7, day=1))]
+        db_handler.add_employee(employee)
+
+    first, second = [e.shifts[0] for e in db_handler.get_employees()]
+
+    assert not hasattr(first, "__dict__")
+    assert first.date is second.date
+    assert first.hours_reg is second.hours_reg
+
+
+def test_create_shift_table__migrates_text_hours():
+    """Test a shift table storing hours as text is migrated to hundredths"""
+
+    db_handler = DatabaseHandler(db=":memory:")
+    db_handler.create_employee_table()
+
+    db_handler.cur.execute(
+        """
+        CREATE TABLE shift(
+            date TEXT, time_in TEXT, time_out TEXT, hours_reg TEXT, hours_ot TEXT,
+            employee_id TEXT REFERENCES employee(employee_id) ON DELETE CASCADE
+        )
+        """
+    )
+    db_handler.add_employee_rows(
+        [("1", "Alissa", "Rivers", "Ornithologist", "Full-time")],
+        [("2024-07-01", "09:00", "17:00", "8.00", "0.07", "1"),
+         ("2024-07-02", None, None, "", "", "1")]
+    )
+
+    db_handler.create_shift_table()
+
+    shifts = db_handler.get_employee("1").shifts
+
+    assert [(s.hours_reg, s.hours_ot) for s in shifts] == [(800, 7), (0, 0)]
+    assert db_handler._get_column_type("shift", "hours_reg") == "INTEGER"
+
+    db_handler.close()
+
+
+def test_create_shift_table__failed_migration_keeps_text_hours():
+    """Test a failed migration leaves the old shift table and its data in place"""
+
+    db_handler = DatabaseHandler(db=":memory:")
+    db_handler.create_employee_table()
+
+    db_handler.cur.execute(
+        """
+        CREATE TABLE shift(
+            date TEXT, time_in TEXT, time_out TEXT, hours_reg TEXT, hours_ot TEXT,
+            employee_id TEXT REFERENCES employee(employee_id) ON DELETE CASCADE
+        )
+        """
+    )
+    db_handler.cur.execute("CREATE INDEX idx_employee_id ON shift (employee_id)")
+
+    # A shift without an employee makes copying into the new table fail
+    db_handler.cur.execute("PRAGMA foreign_keys = OFF")
+    db_handler.add_employee_rows(
+        [("1", "Alissa", "Rivers", "Ornithologist", "Full-time")],
+        [("2024-07-01", "09:00", "17:00", "8.00", "0.07", "1"),
+         ("2024-07-02", None, None, "", "", "2")]
+    )
+    db_handler.cur.execute("PRAGMA foreign_keys = ON")
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db_handler.create_shift_table()
+
+    assert db_handler._get_column_type("shift", "hours_reg") == "TEXT"
+    assert not db_handler._table_exists("shift_text_hours")
+    assert db_handler._table_exists("idx_employee_id")
+    assert db_handler.cur.execute("SELECT COUNT(*) FROM shift").fetchone()[0] == 2
+
+    db_handler.close()
+
+
+def test_iter_hours_totals(db_handler: DatabaseHandler, employee: Employee):
+    pay_period = PayPeriod(
+        start_date=datetime.date(year=2024, month=7, day=1),
+        end_date=datetime.date(year=2024, month=7, day=14)
+    )
+
+    employee.shifts = [
+        Shift(date=datetime.date(year=2024, month=7, day=day), hours_ot=25)
+        for day in [1, 7, 8, 15] # The last is outside the pay period
+    ]
+    db_handler.add_employee(employee)
+    db_handler.add_employee_rows([("2", "Aaron", "Moss", "Pilot", "Part-time")], [])
+
+    rows = list(db_handler.iter_hours_totals(pay_period))
+
+    assert [row[0] for row in rows] == ["2", "1", "1"]
+    assert rows[0][5:] == (None, None, None)
+    assert rows[1][5:] == (0, 1600, 50)
+    assert rows[2][5:] == (1, 800, 25)
+
+
+def test_open_for_thread(tmp_path, employee: Employee):
+    db_handler = DatabaseHandler(str(tmp_path / "test.db"))
+    db_handler.create_employee_table()
+    db_handler.create_shift_table()
+    db_handler.add_employee(employee)
+
+    with db_handler.open_for_thread() as same:
+        assert same is db_handler
+
+    results = []
+
+    def read() -> None:
+        with db_handler.open_for_thread() as other:
+            results.append([row[0] for row in other.iter_shift_rows()])
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    thread.join()
+
+    assert results == [["1"]]
+
+    db_handler.close()
+
+
+def test_employee_order_matches(db_handler: DatabaseHandler, employee: Employee):
+    """Test employees sharing a first name come out in the same order everywhere"""
+
+    pay_period = PayPeriod(
+        start_date=datetime.date(year=2024, month=7, day=1),
+        end_date=datetime.date(year=2024, month=7, day=14)
+    )
+
+    for employee_id in ["3", "1", "2"]:
+        employee.employee_id = employee_id
+        employee.shifts = [Shift(date=datetime.date(year=2024, month=7, day=1))]
+        db_handler.add_employee(employee)
+
+    expected = ["1", "2", "3"]
+
+    assert [e.employee_id for e in db_handler.get_employees()] == expected
+    assert [e.employee_id for e in db_handler.iter_employees()] == expected
+    assert [row[0] for row in db_handler.iter_shift_rows()] == expected
+    assert [row[0] for row in db_handler.iter_hours_totals(pay_period)] == expected
@@ -0,0 +1,88 @@
+import pytest
+
+from gui.employee_filter import EmployeeFilter, FilterIndex
+from db.db_data import Employee
+
+
+def make_employee(employee_id: str, first_name: str, last_name: str) -> Employee:
+    return Employee(
+        employee_id=employee_id,
+        first_name=first_name,
+        last_name=last_name,
+        position="Ornithologist",
+        contract="Full-time",
+        shifts=[]
+    )
+
+
+@pytest.fixture(name="employee_filter")
+def fixture_employee_filter():
+    employee_filter = EmployeeFilter()
+    employee_filter.set_employees([
+        make_employee("1", "Alissa", "Rivers"),
+        make_employee("2", "Alan", "Reed"),
+        make_employee("3", "bob", "Alder"),
+        make_employee("10", "Alissa", "Stone"),
+    ])
+    return employee_filter
+
+
+def test_no_queries(employee_filter: EmployeeFilter):
+    assert employee_filter.get_matching_rows() == [0, 1, 2, 3]
+
+
+def test_prefix_is_case_insensitive(employee_filter: EmployeeFilter):
+    employee_filter.set_query(FilterIndex.FIRST_NAME, "al")
+    assert employee_filter.get_matching_rows() == [0, 1, 3]
+
+    employee_filter.set_query(FilterIndex.FIRST_NAME, "b")
+    assert employee_filter.get_matching_rows() == [2]
+
+
+def test_narrowing_and_widening(employee_filter: EmployeeFilter):
+    """Extending a query narrows the matches, removing characters widens them"""
+
+    for query, expected in [
+        ("a", [0, 1, 3]),
+        ("ali", [0, 3]),
+        ("alissax", []),
+        ("al", [0, 1, 3]),
+        ("", [0, 1, 2, 3]),
+    ]:
+        employee_filter.set_query(FilterIndex.FIRST_NAME, query)
+        assert employee_filter.get_matching_rows() == expected
+
+
+def test_combined_queries(employee_filter: EmployeeFilter):
+    employee_filter.set_queries({
+        FilterIndex.FIRST_NAME: "alissa",
+        FilterIndex.LAST_NAME: "s",
+    })
+    assert employee_filter.get_matching_rows() == [3]
+
+    employee_filter.set_query(FilterIndex.EMPLOYEE_ID, "1")
+    assert employee_filter.get_matching_rows() == [3]
+
+    employee_filter.set_query(FilterIndex.LAST_NAME, None)
+    assert employee_filter.get_matching_rows() == [0, 3]
+
+
+def test_queries_kept_after_set_employees(employee_filter: EmployeeFilter):
+    employee_filter.set_query(FilterIndex.LAST_NAME, "re")
+
+    employee_filter.set_employees([
+        make_employee("1", "Alissa", "Reed"),
+        make_employee("2", "Alan", "Stone"),
+    ])
+
+    assert employee_filter.get_matching_rows() == [0]
+
+
+def test_employee_matcher_keeps_queries(employee_filter: EmployeeFilter):
+    employee_filter.set_query(FilterIndex.FIRST_NAME, "al")
+    matches = employee_filter.get_employee_matcher()
+
+    employee_filter.set_query(FilterIndex.FIRST_NAME, "b")
+
+    assert matches(make_employee("20", "Alma", "Hart"))
+    assert not matches(make_employee("21", "Bea", "Hart"))
@@ -0,0 +1,46 @@
+import zipfile
+
+from backend import employee_timesheets
+from backend.generate_timesheet import RenderMode
+from tests.test_generate_timesheet import make_employee, page_texts, page_words, render
+
+
+def test_save_timesheets_to_directory(tmp_path):
+    employees = [make_employee(str(i)) for i in range(3)]
+
+    employee_timesheets.save_timesheets(employees, str(tmp_path / "out"))
+
+    for employee in employees:
+        pdf = (tmp_path / "out" / f"{employee.employee_id}.pdf").read_bytes()
+        assert page_texts(pdf) == page_texts(render([employee]))
+
+
+def test_save_timesheets_to_zip_in_parallel(tmp_path):
+    employees = [make_employee(str(i)) for i in range(40)]
+    calls = []
+
+    employee_timesheets.save_timesheets(
+        iter(employees),
+        str(tmp_path / "out.zip"),
+        as_zip=True,
+        workers=2,
+        progress_callback=lambda *args: calls.append(args),
+        render_mode=RenderMode.NATIVE,
+        total=len(employees)
+    )
+
+    with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+        assert archive.namelist() == [f"{i}.pdf" for i in range(40)]
+        assert page_words(archive.read("7.pdf")) == page_words(render([employees[7]]))
+
+    assert calls[-1] == (40, 40)
+
+
+def test_get_file_name():
+    used_names = set()
+    names = [
+        employee_timesheets.get_file_name(make_employee(employee_id), used_names)
+        for employee_id in ["A1", "a1", "../x", ""]
+    ]
+
+    assert names == ["A1.pdf", "a1-2.pdf", "_x.pdf", "employee.pdf"]
@@ -0,0 +1,112 @@
+import io
+import csv
+import json
+import zipfile
+import xml.etree.ElementTree as ET
+import pytest
+
+from backend import exporters
+from backend.exporters import ExportFormat
+
+
+ROWS = [
+    ("1", "Alissa", "Rivers", "Ornithologist", "Full-time",
+     "2024-07-01", "09:00", "17:00", 800, 0),
+    ("1", "Alissa", "Rivers", "Ornithologist", "Full-time",
+     "2024-07-02", None, None, 25, 0),
+    ("2", "Aaron", "Moss", "Pilot, <senior>", "Part-time",
+     None, None, None, None, None),
+]
+
+# ROWS with their hours formatted
+FORMATTED_ROWS = [
+    ROWS[0][:8] + ("8.00", "0.00"),
+    ROWS[1][:8] + ("0.25", "0.00"),
+    ROWS[2],
+]
+
+SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+
+def read_sheet(archive: zipfile.ZipFile, name: str) -> list[list]:
+    """Reads a sheet's cells, as numbers for value cells and text otherwise."""
+    root = ET.fromstring(archive.read(name))
+    rows = []
+
+    for row in root.iter(f"{SHEET_NS}row"):
+        cells = []
+
+        for cell in row:
+            value = cell.find(f"{SHEET_NS}v")
+            text = cell.find(f"{SHEET_NS}is/{SHEET_NS}t")
+
+            if value is not None:
+                cells.append(float(value.text))
+            else:
+                cells.append(text.text if text is not None else None)
+
+        rows.append(cells)
+
+    return rows
+
+
+def test_export_format_from_path():
+    assert ExportFormat.from_path("shifts.XLSX") == ExportFormat.XLSX
+
+    with pytest.raises(ValueError):
+        ExportFormat.from_path("shifts.pdf")
+
+
+def test_write_csv():
+    file = io.StringIO()
+    exporters.write_csv(ROWS, file)
+
+    lines = list(csv.reader(io.StringIO(file.getvalue())))
+
+    assert lines[0] == exporters.EXPORT_COLUMNS
+    assert lines[1:] == [[value or "" for value in row] for row in FORMATTED_ROWS]
+
+
+def test_write_jsonl():
+    file = io.StringIO()
+    exporters.write_jsonl(ROWS, file)
+
+    objects = [json.loads(line) for line in file.getvalue().splitlines()]
+
+    assert objects == [dict(zip(exporters.JSONL_KEYS, row)) for row in FORMATTED_ROWS]
+
+
+def test_write_xlsx(tmp_path, monkeypatch):
+    monkeypatch.setattr(exporters, "XLSX_MAX_ROWS", 3) # Header and two rows per sheet
+
+    exporters.write_xlsx(iter(ROWS), str(tmp_path / "shifts.xlsx"))
+
+    with zipfile.ZipFile(tmp_path / "shifts.xlsx") as archive:
+        workbook = ET.fromstring(archive.read("xl/workbook.xml"))
+        sheet_names = [sheet.get("name") for sheet in workbook.iter(f"{SHEET_NS}sheet")]
+        first = read_sheet(archive, "xl/worksheets/sheet1.xml")
+        second = read_sheet(archive, "xl/worksheets/sheet2.xml")
+
+    assert sheet_names == ["Shifts", "Shifts 2"]
+    assert first[0] == second[0] == exporters.EXPORT_COLUMNS
+    assert first[1] == list(ROWS[0][:8]) + [8.0, 0.0] # Hours are numbers
+    assert first[2] == list(ROWS[1][:8]) + [0.25, 0.0]
+    assert second[1] == list(ROWS[2])
+
+
+def test_write_xlsx_empty(tmp_path):
+    exporters.write_xlsx([], str(tmp_path / "shifts.xlsx"))
+
+    with zipfile.ZipFile(tmp_path / "shifts.xlsx") as archive:
+        assert read_sheet(archive, "xl/worksheets/sheet1.xml") == [exporters.EXPORT_COLUMNS]
+
+
+def test_filter_rows():
+    profiles = []
+
+    def include(employee):
+        profiles.append(employee.employee_id)
+        return employee.position == "Pilot, <senior>"
+
+    assert list(exporters.filter_rows(ROWS, include)) == ROWS[2:]
+    assert profiles == ["1", "2"] # Once per employee
@@ -0,0 +1,242 @@
+import io
+import datetime
+import pytest
+
+from pypdf import PdfReader
+from pypdf.generic import ContentStream
+
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+from backend import native_pdf, parallel_timesheet, timesheet_layout
+from db.db_data import Employee, Shift
+import constants
+
+
+def make_employee(employee_id: str) -> Employee:
+    start_date = datetime.date(year=2024, month=7, day=1)
+
+    shifts = [
+        Shift(
+            date=start_date + datetime.timedelta(days=i),
+            hours_ot=(i % 3) * 100 + 50
+        )
+        for i in range(constants.PAY_PERIOD_DAYS)
+    ]
+
+    return Employee(
+        employee_id=employee_id,
+        first_name=f"First{employee_id}",
+        last_name=f"Last{employee_id}",
+        position="Ornithologist",
+        contract="Full-time",
+        shifts=shifts
+    )
+
+
+@pytest.fixture(name="employees")
+def fixture_employees():
+    return [make_employee(str(i)) for i in range(7)]
+
+
+def render(employees: list[Employee], render_mode: RenderMode = RenderMode.TABLE) -> bytes:
+    buffer = io.BytesIO()
+    PDFTimesheet(employees, filename=buffer, render_mode=render_mode).get_pdf().save()
+    return buffer.getvalue()
+
+
+def page_texts(pdf: bytes) -> list[str]:
+    return [page.extract_text() for page in PdfReader(io.BytesIO(pdf)).pages]
+
+
+def page_words(pdf: bytes) -> list[list[str]]:
+    """Words on each page, ignoring the order they were drawn in"""
+    return [sorted(text.split()) for text in page_texts(pdf)]
+
+
+def page_lines(pdf: bytes) -> list[list[tuple]]:
+    """
+    Line segments stroked on each page, as sorted ((x0, y0), (x1, y1)) in page
+    coordinates, following transforms and forms. Ignores the drawing order.
+    """
+    reader = PdfReader(io.BytesIO(pdf))
+    pages = []
+
+    for page in reader.pages:
+        lines = set()
+        state = {"ctm": (1, 0, 0, 1, 0, 0), "start": None}
+        stack = []
+
+        def to_page(x: float, y: float) -> tuple[float, float]:
+            a, b, c, d, e, f = state["ctm"]
+            return round(a * x + c * y + e, 1), round(b * x + d * y + f, 1)
+
+        def walk(operations, resources) -> None:
+            for operands, operator in operations:
+                if operator == b"q":
+                    stack.append(state["ctm"])
+                elif operator == b"Q":
+                    state["ctm"] = stack.pop()
+                elif operator == b"cm":
+                    a2, b2, c2, d2, e2, f2 = map(float, operands)
+                    a, b, c, d, e, f = state["ctm"]
+                    state["ctm"] = (
+                        a2 * a + b2 * c, a2 * b + b2 * d,
+                        c2 * a + d2 * c, c2 * b + d2 * d,
+                        e2 * a + f2 * c + e, e2 * b + f2 * d + f
+                    )
+                elif operator == b"m":
+                    state["start"] = to_page(*map(float, operands))
+                elif operator == b"l":
+                    end = to_page(*map(float, operands))
+                    lines.add(tuple(sorted([state["start"], end])))
+                    state["start"] = end
+                elif operator == b"Do":
+                    form = resources["/XObject"][operands[0]].get_object()
+
+                    stack.append(state["ctm"])
+                    walk(ContentStream(form, reader).operations, form.get("/Resources", resources))
+                    state["ctm"] = stack.pop()
+
+        walk(ContentStream(page.get_contents(), reader).operations, page["/Resources"])
+        pages.append(sorted(lines))
+
+    return pages
+
+
+def test_one_page_per_employee(employees: list[Employee]):
+    texts = page_texts(render(employees))
+
+    assert len(texts) == len(employees)
+    assert constants.COMPANY_NAME in texts[0]
+    assert constants.COMPANY_NAME not in texts[1]
+
+
+def test_page_offset(employees: list[Employee]):
+    buffer = io.BytesIO()
+    PDFTimesheet(employees[:1], filename=buffer, page_offset=4).get_pdf().save()
+
+    text = page_texts(buffer.getvalue())[0]
+
+    assert constants.COMPANY_NAME not in text
+    assert text.rstrip().endswith("5")
+
+
+def test_progress_callback(employees: list[Employee]):
+    calls = []
+    PDFTimesheet(employees, filename=io.BytesIO(), progress_callback=lambda *args: calls.append(args))
+
+    assert calls == [(i + 1, len(employees)) for i in range(len(employees))]
+
+
+def test_parallel_matches_serial(employees: list[Employee], tmp_path):
+    file_path = tmp_path / "parallel.pdf"
+
+    parallel_timesheet.save_timesheet(employees, str(file_path), workers=2, shard_size=3)
+
+    assert page_texts(file_path.read_bytes()) == page_texts(render(employees))
+
+
+def test_template_matches_table(employees: list[Employee]):
+    # Layouts differ with empty times and wider hours
+    employees[1].shifts[3].time_in = None
+    employees[2].shifts[0].hours_reg = 1225
+
+    assert page_words(render(employees, RenderMode.TEMPLATE)) == page_words(render(employees))
+
+
+def test_canvas_matches_table(employees: list[Employee]):
+    employees[1].shifts[3].time_in = None
+    employees[2].shifts[0].hours_reg = 1225
+
+    assert page_words(render(employees, RenderMode.CANVAS)) == page_words(render(employees))
+
+
+@pytest.mark.parametrize("render_mode", list(RenderMode))
+def test_empty_report_has_header(render_mode: RenderMode):
+    texts = page_texts(render([], render_mode))
+
+    assert len(texts) == 1
+    assert constants.COMPANY_NAME in texts[0]
+    assert "CREW TIMESHEET" in texts[0]
+
+
+@pytest.mark.parametrize("render_mode", [RenderMode.TEMPLATE, RenderMode.CANVAS, RenderMode.NATIVE])
+def test_lines_match_table(employees: list[Employee], render_mode: RenderMode):
+    employees[1].shifts[3].time_in = None
+    employees[2].shifts[0].hours_reg = 1225
+
+    expected = page_lines(render(employees))
+
+    assert all(expected)
+    assert page_lines(render(employees, render_mode)) == expected
+
+
+def test_layout_table_size_matches_platypus(employees: list[Employee]):
+    timesheet = PDFTimesheet([], filename=io.BytesIO())
+    pdf_table = timesheet._create_pdf_timesheet_table(employees[0].shifts[0:7])
+
+    tables = [
+        timesheet._create_timesheet_table(pdf_table.rows),
+        timesheet._create_header_title_table(),
+        timesheet._create_header_subtitle_table()
+    ]
+
+    for table in tables:
+        expected = table.wrapOn(timesheet.get_pdf(), 0, 0)
+        assert timesheet_layout.get_table_size(table) == pytest.approx(expected)
+
+
+def test_native_matches_table(employees: list[Employee]):
+    employees[1].shifts[3].time_in = None
+    employees[2].shifts[0].hours_reg = 1225
+
+    assert page_words(render(employees, RenderMode.NATIVE)) == page_words(render(employees))
+
+
+def test_native_page_offset_and_empty(employees: list[Employee]):
+    buffer = io.BytesIO()
+    PDFTimesheet(
+        employees[:1], filename=buffer, page_offset=4, render_mode=RenderMode.NATIVE
+    ).get_pdf().save()
+
+    assert page_texts(buffer.getvalue())[0].rstrip().endswith("5")
+    assert page_words(render([], RenderMode.NATIVE)) == page_words(render([]))
+
+
+def test_native_from_iterator(employees: list[Employee]):
+    buffer = io.BytesIO()
+    calls = []
+
+    PDFTimesheet(
+        iter(employees),
+        filename=buffer,
+        progress_callback=lambda *args: calls.append(args),
+        render_mode=RenderMode.NATIVE,
+        total=len(employees)
+    ).get_pdf().save()
+
+    assert page_words(buffer.getvalue()) == page_words(render(employees))
+    assert calls[-1] == (len(employees), len(employees))
+
+
+def test_native_closes_file_on_error(employees: list[Employee], tmp_path, monkeypatch):
+    files = []
+
+    def recording_open(*args, **kwargs):
+        files.append(open(*args, **kwargs))
+        return files[-1]
+
+    monkeypatch.setattr(native_pdf, "open", recording_open, raising=False)
+    employees[1].shifts.pop()
+
+    with pytest.raises(ValueError):
+        PDFTimesheet(employees, filename=str(tmp_path / "out.pdf"), render_mode=RenderMode.NATIVE)
+
+    assert len(files) == 1 and files[0].closed
+
+
+def test_native_centres_replaced_text():
+    writer = native_pdf.NativePDFWriter(io.BytesIO())
+    content = writer.format_text([(100, 50, "中", "Helvetica", 12, True)])
+
+    x = 100 - timesheet_layout.string_width("?", "Helvetica", 12) / 2
+    assert f"1 0 0 1 {native_pdf.format_number(x)} 50 Tm (?) Tj" in content
@@ -0,0 +1,87 @@
+import json
+import pytest
+
+from backend import latency_stats
+from backend.backend import Backend, error_handler
+from backend.latency_stats import LatencyStats
+from db.db_handler import DatabaseHandler
+
+
+@pytest.fixture(name="stats")
+def fixture_stats(monkeypatch):
+    monkeypatch.setattr(latency_stats, "active", None)
+    return latency_stats.enable()
+
+
+def test_percentiles():
+    stats = LatencyStats()
+
+    for ms in range(1, 101):
+        stats.record("method", ms / 1000)
+
+    result = stats.to_dict()["method"]
+
+    assert result["calls"] == 100
+    assert result["p50_ms"] == pytest.approx(50, rel=0.1)
+    assert result["p95_ms"] == pytest.approx(95, rel=0.1)
+    assert result["p99_ms"] == pytest.approx(99, rel=0.1)
+    assert result["max_ms"] == pytest.approx(100)
+
+
+def test_records_backend_calls(stats: LatencyStats, tmp_path):
+    backend = Backend(DatabaseHandler(db=":memory:"))
+    backend.get_employees()
+    backend.get_employees()
+    backend.shutdown()
+
+    @error_handler
+    def fail():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        fail()
+
+    stats.dump(str(tmp_path / "latency.json"))
+    result = json.loads((tmp_path / "latency.json").read_text())
+
+    assert result["Backend.get_employees"]["calls"] == 2
+    assert result["Backend.get_employees"]["errors"] == 0
+    assert result[fail.__qualname__]["errors"] == 1
+
+
+def test_records_generator_consumption(stats: LatencyStats, caplog):
+    backend = Backend(DatabaseHandler(db=":memory:"))
+    backend.add_employee(backend.create_blank_employee())
+
+    employees = backend.iter_employees()
+    assert "Backend.iter_employees" not in stats.methods # Only timed once consumed
+
+    assert len(list(employees)) == 1
+
+    employees = backend.iter_employees()
+    next(employees)
+    employees.close() # Stopped before it was exhausted
+    backend.shutdown()
+
+    @error_handler
+    def fail_midway():
+        yield 1
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        list(fail_midway())
+
+    assert stats.methods["Backend.iter_employees"].calls == 2
+    assert stats.methods["Backend.iter_employees"].errors == 0
+    assert stats.methods[fail_midway.__qualname__].errors == 1
+    assert "Caught an unexpected exception" in caplog.text
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.setattr(latency_stats, "active", None)
+
+    backend = Backend(DatabaseHandler(db=":memory:"))
+    backend.get_employees()
+    backend.shutdown()
+
+    assert latency_stats.active is None
@@ -0,0 +1,98 @@
+import io
+import datetime
+import threading
+import pytest
+
+from backend.backend import Backend
+from backend.generate_timesheet import PDFTimesheet, RenderMode
+from backend.page_cache import PageCache, get_employee_key
+from db.db_handler import DatabaseHandler
+from tests.test_generate_timesheet import make_employee, render
+
+
+@pytest.fixture(name="page_cache")
+def fixture_page_cache():
+    page_cache = PageCache(db=":memory:") # RAM database
+
+    yield page_cache
+
+    page_cache.close()
+
+
+def render_cached(employees, page_cache: PageCache) -> bytes:
+    buffer = io.BytesIO()
+    PDFTimesheet(
+        employees, filename=buffer, render_mode=RenderMode.NATIVE, page_cache=page_cache
+    ).get_pdf().save()
+
+    return buffer.getvalue()
+
+
+def test_regenerate_only_changed(page_cache: PageCache):
+    employees = [make_employee(str(i)) for i in range(5)]
+    render_cached(employees, page_cache)
+
+    employees[2].shifts[4].time_out = datetime.time(hour=18)
+    page_cache.hits = page_cache.misses = 0
+
+    pdf = render_cached(employees, page_cache)
+
+    assert (page_cache.hits, page_cache.misses) == (4, 1)
+    assert pdf == render(employees, RenderMode.NATIVE)
+
+
+def test_key_changes_with_inputs():
+    employee = make_employee("1")
+    key = get_employee_key(employee)
+
+    employee.shifts[13].hours_ot = 25
+
+    assert get_employee_key(employee) != key
+
+
+def test_evicts_least_recently_used(page_cache: PageCache):
+    for key in ["a", "b", "c"]:
+        page_cache.put(key, key * 1000)
+        page_cache.flush()
+
+    page_cache.get("a") # "b" is now the least recently used
+    page_cache.max_bytes = page_cache.get_size() - 1
+    page_cache.flush()
+
+    assert page_cache.get("b") is None
+    assert page_cache.get("a") == "a" * 1000
+    assert page_cache.get("c") == "c" * 1000
+
+
+def test_needs_native_mode(page_cache: PageCache):
+    with pytest.raises(ValueError):
+        PDFTimesheet([], filename=io.BytesIO(), page_cache=page_cache)
+
+
+def test_backend_caches_from_worker_thread(tmp_path):
+    """Test a report saved off the thread that opened the cache, like the GUI's"""
+
+    page_cache = PageCache(str(tmp_path / "cache.db"))
+    backend = Backend(DatabaseHandler(db=":memory:"), page_cache)
+    employees = [make_employee(str(i)) for i in range(3)]
+    errors = []
+
+    def save() -> None:
+        try:
+            backend.save_timesheet(
+                employees, str(tmp_path / "report.pdf"), render_mode=RenderMode.NATIVE
+            )
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=save)
+    thread.start()
+    thread.join()
+
+    assert errors == []
+    assert (tmp_path / "report.pdf").read_bytes() == render(employees, RenderMode.NATIVE)
+
+    for employee in employees:
+        assert page_cache.get(get_employee_key(employee)) is not None
+
+    backend.shutdown()
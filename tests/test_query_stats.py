@@ -0,0 +1,65 @@
+import itertools
+import types
+import pytest
+
+from benchmarks import synthetic_data
+from db import query_stats
+from db.db_handler import DatabaseHandler
+from db.query_stats import QueryStats
+
+
+SHIFTS_SQL = "SELECT * FROM shift WHERE employee_id=:employee_id ORDER BY date"
+
+
+@pytest.fixture(name="db_handler")
+def fixture_db_handler():
+    db_handler = DatabaseHandler(db=":memory:", query_stats=QueryStats(slowest_limit=3))
+    synthetic_data.fill_db(db_handler, 20)
+    db_handler.query_stats.reset()
+
+    yield db_handler
+
+    db_handler.close()
+
+
+def test_counts_statements(db_handler: DatabaseHandler):
+    db_handler.get_employees()
+
+    query_stats = db_handler.query_stats
+    statements = {stats.sql: stats for stats in query_stats.get_statements()}
+
+    # One query per employee for their shifts
+    assert statements[SHIFTS_SQL].count == 20
+    assert query_stats.get_statement_count() == 21
+    assert len(query_stats.get_slowest()) == 3
+    assert "      20" in query_stats.format_report()
+
+
+def test_includes_fetch_time(db_handler: DatabaseHandler):
+    rows = list(db_handler.iter_employees(batch_size=5))
+
+    stats = next(
+        stats for stats in db_handler.query_stats.get_statements()
+        if stats.sql == "SELECT * FROM employee ORDER BY first_name, employee_id"
+    )
+
+    assert len(rows) == 20
+    assert stats.count == 1
+    assert stats.max_seconds == pytest.approx(stats.total_seconds)
+
+
+def test_includes_iteration_time(db_handler: DatabaseHandler, monkeypatch):
+    # Each clock reading is a second later, so every timed step takes 1s
+    clock = itertools.count()
+    monkeypatch.setattr(query_stats, "time", types.SimpleNamespace(perf_counter=lambda: next(clock)))
+
+    cur = db_handler._create_cursor()
+    rows = list(cur.execute("SELECT * FROM employee"))
+    cur.close()
+
+    stats = db_handler.query_stats.statements["SELECT * FROM employee"]
+
+    # The execute, then a step per row and one more to find the end
+    assert len(rows) == 20
+    assert stats.total_seconds == 1 + len(rows) + 1
+    assert stats.max_seconds == stats.total_seconds
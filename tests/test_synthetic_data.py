@@ -0,0 +1,46 @@
+import csv
+
+from backend.backend import Backend
+from benchmarks import synthetic_data
+from db.db_handler import DatabaseHandler
+
+
+def test_same_seed_same_data():
+    assert list(synthetic_data.iter_rows(50, seed=1)) == list(synthetic_data.iter_rows(50, seed=1))
+    assert list(synthetic_data.iter_rows(50, seed=1)) != list(synthetic_data.iter_rows(50, seed=2))
+
+
+def test_fill_db_matches_employees():
+    db_handler = DatabaseHandler(db=":memory:") # RAM database
+    synthetic_data.fill_db(db_handler, 30, seed=3)
+
+    employees = synthetic_data.make_employees(30, seed=3)
+    key = lambda employee: employee.employee_id
+
+    assert sorted(db_handler.get_employees(), key=key) == employees
+    assert db_handler.get_pay_period().start_date == synthetic_data.DEFAULT_START_DATE
+
+    db_handler.close()
+
+
+def test_employees_csv_imports(tmp_path):
+    csv_path = str(tmp_path / "employees.csv")
+    synthetic_data.write_employees_csv(csv_path, 20)
+
+    backend = Backend(DatabaseHandler(db=":memory:"))
+    employees = backend.generate_employees_from_csv(csv_path)
+    backend.shutdown()
+
+    assert [employee.employee_id for employee in employees] == [
+        employee.employee_id for employee in synthetic_data.make_employees(20)
+    ]
+
+
+def test_shifts_csv(tmp_path):
+    csv_path = tmp_path / "shifts.csv"
+    synthetic_data.write_shifts_csv(str(csv_path), 5)
+
+    with open(csv_path, newline="", encoding="utf-8") as file:
+        rows = list(csv.reader(file))
+
+    assert len(rows) == 1 + 5 * len(synthetic_data.make_employees(1)[0].shifts)
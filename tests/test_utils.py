@@ -0,0 +1,48 @@
+import datetime
+import pytest
+
+import utils
+import validation
+
+
+def test_parse_hours():
+    assert utils.parse_hours("8.5") == 850
+    assert utils.parse_hours("0.07") == 7
+    assert utils.parse_hours(".") == 0
+    assert utils.parse_hours("") == 0
+
+    for hours in ["1.2.3", "8.505", "123", "٣.٥"]:
+        with pytest.raises(ValueError):
+            utils.parse_hours(hours)
+
+
+def test_valid_hours_parse():
+    for hours in ["", ".", "7", "7.", ".25", "12.25", "8.505", "٣.٥", "8\n"]:
+        assert validation.validate_hours(hours) == (hours in ["", ".", "7", "7.", ".25", "12.25"])
+
+        if validation.validate_hours(hours):
+            utils.parse_hours(hours)
+
+
+def test_format_hours():
+    assert utils.format_hours(850) == "8.50"
+    assert utils.format_hours(7) == "0.07"
+    assert utils.format_hours(utils.parse_hours("12.25")) == "12.25"
+
+
+def test_decode_date():
+    date = utils.decode_date("2024-07-01")
+
+    assert date == datetime.date(year=2024, month=7, day=1)
+    assert utils.decode_date("2024-07-01") is date
+
+
+def test_decode_time():
+    time = utils.decode_time("09:30")
+
+    assert time == datetime.time(hour=9, minute=30)
+    assert utils.decode_time("09:30") is time
+    assert utils.decode_time(None) is None
+
+    with pytest.raises(ValueError):
+        utils.decode_time("9:30 AM")
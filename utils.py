@@ -1,14 +1,81 @@
 import os
+import re
 import datetime
+from functools import lru_cache
+from typing import Union
+
+# Hours as entered, with up to 2 digits before and after the decimal point.
+# ASCII only, so digits from other scripts aren't accepted
+HOURS_REGEX = re.compile(r"(\d{0,2})(?:\.(\d{0,2}))?", re.ASCII)
+
+MAX_DECODED = 4096 # Entries kept in each decode memo before it's cleared
+
+# Decoded ISO dates and times, by their text. A pay period only has 14 dates
+# and a few distinct times, so nearly every decode is a lookup.
+_decoded_dates: dict[str, datetime.date] = {}
+_decoded_times: dict[str, datetime.time] = {}
 
 def next_date(curr_date: datetime.date, days: int) -> datetime.date:
     return curr_date + datetime.timedelta(days=days)
 
-def str_to_date(date: str, format: str) -> datetime.date:
-    return datetime.datetime.strptime(date, format).date()
+def decode_date(date: str) -> datetime.date:
+    """
+    Decodes an ISO date, like "2024-07-01", as dates are stored in the
+    database. Memoized, so equal dates decode to the same object.
+    """
+    decoded = _decoded_dates.get(date)
+
+    if decoded is None:
+        if len(_decoded_dates) >= MAX_DECODED:
+            _decoded_dates.clear()
+
+        decoded = _decoded_dates[date] = datetime.date.fromisoformat(date)
+
+    return decoded
+
+def decode_time(time: Union[str, None]) -> Union[datetime.time, None]:
+    """
+    Decodes an ISO time, like "09:30", as times are stored in the database.
+    Missing times decode to None. Memoized, so equal times decode to the same
+    object.
+    """
+    if not time:
+        return None
+
+    decoded = _decoded_times.get(time)
+
+    if decoded is None:
+        if len(_decoded_times) >= MAX_DECODED:
+            _decoded_times.clear()
+
+        decoded = _decoded_times[time] = datetime.time.fromisoformat(time)
+
+    return decoded
+
+@lru_cache(maxsize=4096)
+def parse_hours(hours: str) -> int:
+    """
+    Converts hours, like "8.5", to integer hundredths of an hour, like 850.
+    Parsed as fixed point, so there's no float rounding. Empty hours are 0.
+
+    :raises ValueError: If the hours don't match HOURS_REGEX, such as hours
+        with more than 2 decimal places.
+    """
+    match = HOURS_REGEX.fullmatch(hours.strip())
+
+    if match is None:
+        raise ValueError(f"invalid hours: {hours!r}")
+
+    whole, fraction = match.group(1), match.group(2) or ""
+
+    return int(whole or 0) * 100 + int(fraction.ljust(2, "0"))
 
-def str_to_time(time: str, format: str) -> datetime.date:
-    return datetime.datetime.strptime(time, format).time()
+@lru_cache(maxsize=4096)
+def format_hours(hundredths: int) -> str:
+    """
+    Formats hundredths of an hour as hours with two decimals, like "8.50".
+    """
+    return f"{hundredths // 100}.{hundredths % 100:02d}"
 
 def load_file(relative_path: str) -> str:
     absolute_path = os.path.join(os.path.dirname(__file__), relative_path)